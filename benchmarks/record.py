@@ -0,0 +1,75 @@
+"""Per-record memory and construction cost of Uplink against plain dicts.
+
+Run from the repository root::
+
+    python benchmarks/record.py [export.csv] [rows]
+
+Both representations are built from the same ``csv.reader`` rows, so the
+timings cover only record construction.  Memory is the ``tracemalloc``
+growth per retained record, including the strings a dict keeps alive.
+"""
+
+from __future__ import annotations
+
+import csv
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jamaica_bay import UPLINK_V1, Uplink  # noqa: E402
+from jamaica_bay.categorical import Dictionary  # noqa: E402
+
+
+def read_rows(path: str, limit: int) -> list[list[str]]:
+    with open(path, newline="") as fh:
+        rows = [r for r in csv.reader(fh) if r and r[4].isdigit()]
+    return rows[:limit]
+
+
+def measure(build, rows) -> tuple[float, float]:
+    """Return (bytes per record, microseconds per record) of ``build``."""
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        build(rows)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(rows)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size / len(rows), best / len(rows) * 1e6
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "jamaica_bay_20250924.csv"
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    rows = read_rows(path, limit)
+    # The reception columns repeat per group; number them so that every one
+    # of the 39 fields keeps its own key (gtw_id_0 ... snr_6).
+    header = list(UPLINK_V1.header)
+    for k, group in enumerate(UPLINK_V1.reception_groups):
+        for i in group:
+            header[i] = f"{header[i]}_{k}"
+
+    # Copy the strings so each dict owns its values, as a parsed message would.
+    def dicts(rows):
+        return [dict(zip(header, ["".join(f) for f in row])) for row in rows]
+
+    def records(rows):
+        dictionary = Dictionary()
+        return [Uplink.from_row(row, dictionary=dictionary) for row in rows]
+
+    print(f"{len(rows)} rows of {path}")
+    print(f"{'':8} {'bytes/record':>14} {'us/record':>10}")
+    for name, build in [("dict", dicts), ("Uplink", records)]:
+        size, cost = measure(build, rows)
+        print(f"{name:8} {size:14.0f} {cost:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
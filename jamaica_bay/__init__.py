@@ -0,0 +1,78 @@
+"""Fast ingest and analysis of the Jamaica Bay wind sensor uplink exports."""
+
+from .align import Aligned, align, regular_grid
+from .cache import ExportCache
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .circular import DirectionStats
+from .dedup import counter_epochs, deduplicate
+from .gaps import Delivery, GapIndex, delivery, frame_gaps
+from .index import TimeIndex
+from .ingest import Watermark, ingest, read_new
+from .loader import load_export, parse_buffer
+from .parallel import ingest_parallel
+from .query import Scan, scan
+from .record import Uplink, iter_uplinks
+from .resample import WindBins, resample_wind, wind_levels
+from .rolling import GustDetector, Gusts, RollingExtremum, RollingStats, StreamingStats, gusts, rolling_stats
+from .rose import DailyRoses, WindRose
+from .schema import UPLINK_V1, ExportSchema, SchemaError, register, sniff
+from .sketch import KLLSketch
+from .store import ChannelStore
+from .stream import iter_batches
+from .table import CHANNELS, MISSING_RSSI, EventTable, ReceptionTable, UplinkTable
+from .weibull import WeibullFit, fit_weibull, weibull_climatology
+
+__all__ = [
+    "Aligned",
+    "CHANNELS",
+    "ChannelStore",
+    "DEFAULT_DICTIONARY",
+    "DailyRoses",
+    "Delivery",
+    "Dictionary",
+    "DirectionStats",
+    "EventTable",
+    "ExportCache",
+    "ExportSchema",
+    "GapIndex",
+    "GustDetector",
+    "Gusts",
+    "KLLSketch",
+    "MISSING_RSSI",
+    "ReceptionTable",
+    "RollingExtremum",
+    "RollingStats",
+    "Scan",
+    "SchemaError",
+    "StreamingStats",
+    "TimeIndex",
+    "UPLINK_V1",
+    "Uplink",
+    "UplinkTable",
+    "Watermark",
+    "WeibullFit",
+    "WindBins",
+    "WindRose",
+    "align",
+    "counter_epochs",
+    "deduplicate",
+    "delivery",
+    "fit_weibull",
+    "frame_gaps",
+    "gusts",
+    "ingest",
+    "ingest_parallel",
+    "iter_batches",
+    "iter_uplinks",
+    "load_export",
+    "parse_buffer",
+    "read_new",
+    "register",
+    "regular_grid",
+    "resample_wind",
+    "rolling_stats",
+    "scan",
+    "sniff",
+    "weibull_climatology",
+    "wind_levels",
+]
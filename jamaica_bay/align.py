@@ -0,0 +1,155 @@
+"""Alignment of irregular uplinks onto a common time grid.
+
+Uplinks arrive every ~93 s with jitter and outages; joining them with tide
+gauges or model output needs values at given times.  :func:`align`
+interpolates every channel of every device onto one grid at once.  Scalars
+are interpolated linearly between the samples either side of each grid
+time.  Direction is interpolated through the wind components
+
+    u = -speed * sin(dir),  v = -speed * cos(dir)
+
+so that 350 and 10 degrees meet at 0, not 180.  A grid time whose
+bracketing samples are further apart than ``max_gap``, or straddle a gap of
+a :class:`~jamaica_bay.gaps.GapIndex`, is NaN; nothing is extrapolated
+beyond a device's first or last sample.
+
+The bracketing samples come from a single ``np.searchsorted`` for all
+devices.  The samples are sorted by device and time, and each
+``(device, time)`` pair is packed into one int64 key: the device times the
+number of distinct times, plus the rank of the time.  The grid times of
+every device are packed the same way, so one search finds them all.
+Channels with the same missing samples share the search.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from . import circular
+from .categorical import Dictionary
+from .gaps import GapIndex
+from .resample import parse_interval
+from .table import CHANNELS, UplinkTable, _default_dictionary
+
+#: Widest spacing of two samples still interpolated between: about three missed frames.
+DEFAULT_MAX_GAP = "5min"
+
+
+@dataclass
+class Aligned:
+    """Channel values on a grid: ``columns[name][k, j]`` is device ``device_id[k]`` at ``time[j]``."""
+
+    time: np.ndarray
+    device_id: np.ndarray
+    columns: dict[str, np.ndarray]
+    dictionary: Dictionary = field(default_factory=_default_dictionary, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def device_code(self, name: str | bytes) -> int:
+        """Code of device ``name``, or -1 if it is unknown."""
+        return self.dictionary.code(name)
+
+    def for_device(self, name: str | bytes) -> dict[str, np.ndarray]:
+        """Grid values of every channel of device ``name``."""
+        rows = np.flatnonzero(self.device_id == self.device_code(name))
+        if not rows.size:
+            raise KeyError(name)
+        return {channel: values[rows[0]] for channel, values in self.columns.items()}
+
+
+def regular_grid(start, end, interval="10min") -> np.ndarray:
+    """Times ``start, start + interval, ...`` before ``end``, as datetime64[ns]."""
+    start = np.datetime64(start, "ns")
+    return np.arange(start, np.datetime64(end, "ns"), parse_interval(interval))
+
+
+def align(
+    table: UplinkTable,
+    grid,
+    names=CHANNELS,
+    max_gap=DEFAULT_MAX_GAP,
+    gaps: GapIndex | None = None,
+) -> Aligned:
+    """Interpolate the channels ``names`` of every device in ``table`` at the ``grid`` times.
+
+    ``grid`` is any array of times, e.g. from :func:`regular_grid`.
+    ``max_gap=None`` interpolates across any spacing.  A sample exactly at a
+    grid time is taken as is.  ``dir`` is NaN where the interpolated wind
+    vector is calm.
+    """
+    grid = np.asarray(grid, dtype="datetime64[ns]").view(np.int64)
+    devices = np.unique(table.device_id)
+    order = np.lexsort((table.received_at, table.device_id))
+    device = np.searchsorted(devices, table.device_id[order])
+    t = table.received_at[order].view(np.int64)
+    segment = None if gaps is None else gaps.segments(table.device_id[order], table.received_at[order])
+    limit = np.iinfo(np.int64).max if max_gap is None else int(parse_interval(max_gap).view(np.int64))
+
+    values = {name: getattr(table, name)[order].astype(np.float64) for name in names if name != "dir"}
+    if "dir" in names:
+        speed = table.speed[order].astype(np.float64)
+        rad = np.radians(table.dir[order].astype(np.float64))
+        values["u"], values["v"] = -speed * np.sin(rad), -speed * np.cos(rad)
+
+    # Channels missing the same samples share one bracket search.
+    groups: list[tuple[np.ndarray, list[str]]] = []
+    for name, x in values.items():
+        valid = ~np.isnan(x) & (t != np.iinfo(np.int64).min)
+        for mask, members in groups:
+            if np.array_equal(mask, valid):
+                members.append(name)
+                break
+        else:
+            groups.append((valid, [name]))
+
+    shape = (len(devices), len(grid))
+    columns = {}
+    for mask, members in groups:
+        seg = None if segment is None else segment[mask]
+        lo, hi, w, ok = _brackets(device[mask], t[mask], seg, grid, len(devices), limit)
+        for name in members:
+            x = values[name][mask]
+            if x.size:
+                columns[name] = np.where(ok, x[lo] + w * (x[hi] - x[lo]), np.nan).reshape(shape)
+            else:
+                columns[name] = np.full(shape, np.nan)
+    if "dir" in names:
+        columns["dir"] = circular.mean_direction(-columns.pop("u"), -columns.pop("v"))
+    return Aligned(grid.view("datetime64[ns]"), devices, {name: columns[name] for name in names}, table.dictionary)
+
+
+def _brackets(device, t, segment, grid, n_devices, limit):
+    """Samples ``lo, hi`` either side of each ``(device, grid time)``, the weight of ``hi`` and validity.
+
+    ``device`` and ``t`` are sorted by device, then time.  Queries run over
+    all grid times of device 0, then of device 1, and so on.
+    """
+    n = len(t)
+    query_device = np.repeat(np.arange(n_devices), len(grid))
+    query_t = np.tile(grid, n_devices)
+    if not n:
+        zero = np.zeros(query_t.size, dtype=np.int64)
+        return zero, zero, np.zeros(query_t.size), np.zeros(query_t.size, dtype=bool)
+    times = np.unique(np.concatenate([t, grid]))
+    keys = device * len(times) + np.searchsorted(times, t)
+    queries = query_device * len(times) + np.searchsorted(times, query_t)
+    before = np.searchsorted(keys, queries, side="right") - 1
+    lo = np.maximum(before, 0)
+    hi = np.minimum(before + 1, n - 1)
+    has_lo = (before >= 0) & (device[lo] == query_device)
+    has_hi = (before + 1 < n) & (device[hi] == query_device)
+    exact = has_lo & (t[lo] == query_t)
+    ok = has_lo & has_hi & (t[hi] - t[lo] <= limit)
+    if segment is not None:
+        ok &= segment[lo] == segment[hi]
+    ok |= exact
+    with np.errstate(invalid="ignore", divide="ignore"):
+        w = np.where(ok & ~exact, (query_t - t[lo]) / (t[hi] - t[lo]), 0.0)
+    return lo, hi, w, ok
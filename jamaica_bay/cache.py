@@ -0,0 +1,300 @@
+"""Day-partitioned on-disk cache of parsed exports.
+
+Each export is parsed once and written as one directory per UTC day of
+``received_at``, holding one ``.npy`` file per column::
+
+    <root>/manifest.json
+    <root>/dictionary.json
+    <root>/<export stem>/<content hash>/day=2025-08-06/received_at.npy
+                                                      speed.npy ...
+                                                      receptions/uplink.npy ...
+    <root>/<export stem>/<content hash>/events/...
+    <root>/sketches/day=2025-08-05/speed.npz ...
+
+The manifest records the SHA-256 of every source export together with the
+``received_at`` range of each partition.  Identifier columns are stored as
+codes of the cache-wide dictionary in ``dictionary.json``.  A cached export
+is reparsed only when its content hash changes, and reads memory-map just
+the partitions that overlap the requested time range.
+
+For every America/New_York local day the cache also keeps a KLL quantile
+sketch of each channel in :data:`SKETCH_CHANNELS`, built from the
+deduplicated uplinks of all cached exports, so percentiles over a range of
+days merge a few sketches instead of sorting the values.  Adding an export
+rebuilds the sketches of the local days it touches.
+
+The columns are plain NumPy ``.npy`` files rather than Parquet/Arrow so that
+the cache needs nothing beyond NumPy and every column can be memory-mapped
+as-is.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from .categorical import Dictionary
+from .dedup import deduplicate
+from .loader import load_export
+from .sketch import KLLSketch
+from .table import EventTable, ReceptionTable, UplinkTable
+
+MANIFEST = "manifest.json"
+DICTIONARY = "dictionary.json"
+SKETCHES = "sketches"
+FORMAT_VERSION = 5
+
+_HASH_CHUNK = 1 << 20
+
+RECEPTION_COLUMNS = ReceptionTable.column_names()
+EVENT_COLUMNS = EventTable.column_names()
+
+#: Channels sketched per local day.
+SKETCH_CHANNELS = ("speed", "temperature", "pressure")
+
+# America/New_York is four or five hours behind UTC.
+_EDT = np.timedelta64(4, "h")
+_EST = np.timedelta64(5, "h")
+
+
+def content_hash(path: str | os.PathLike) -> str:
+    """SHA-256 of a file's bytes, as hex."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_columns(directory: Path, columns: dict[str, np.ndarray]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, values in columns.items():
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(values), allow_pickle=False)
+
+
+def load_columns(directory: Path, names, mmap: bool = True) -> dict[str, np.ndarray]:
+    mode = "r" if mmap else None
+    return {name: np.load(directory / f"{name}.npy", mmap_mode=mode, allow_pickle=False) for name in names}
+
+
+class ExportCache:
+    """Parsed exports cached under ``root``, partitioned by UTC day."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._read_manifest()
+        self.dictionary = Dictionary.load(self.root / DICTIONARY)
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.root / MANIFEST) as fh:
+                manifest = json.load(fh)
+        except FileNotFoundError:
+            return {"format": FORMAT_VERSION, "sources": {}, "sketches": []}
+        if manifest.get("format") != FORMAT_VERSION:
+            return {"format": FORMAT_VERSION, "sources": {}, "sketches": []}
+        return manifest
+
+    def _write_manifest(self) -> None:
+        tmp = self.root / f"{MANIFEST}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self.manifest, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self.root / MANIFEST)
+
+    def add(self, path: str | os.PathLike) -> bool:
+        """Cache export ``path``; returns whether it had to be (re)parsed.
+
+        A source whose size and mtime match the manifest is trusted without
+        rehashing; otherwise it is rehashed and reparsed only if its content
+        actually changed.
+        """
+        path = Path(path)
+        stat = path.stat()
+        entry = self.manifest["sources"].get(path.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return False
+        digest = content_hash(path)
+        if entry and entry["sha256"] == digest:
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            self._write_manifest()
+            return False
+
+        target = self.root / path.stem / digest[:16]
+        tmp = target.with_name(target.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        partitions = self._write_partitions(load_export(path, dictionary=self.dictionary), tmp)
+        # Saved before the manifest, so no cached code is ever missing from it.
+        self.dictionary.save(self.root / DICTIONARY)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp, target)
+        if entry and entry["sha256"] != digest:
+            shutil.rmtree(self.root / path.stem / entry["sha256"][:16], ignore_errors=True)
+
+        self.manifest["sources"][path.name] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "directory": str(target.relative_to(self.root)),
+            "partitions": partitions,
+        }
+        self._update_sketches(partitions + (entry["partitions"] if entry else []))
+        self._write_manifest()
+        return True
+
+    @staticmethod
+    def _write_partitions(table: UplinkTable, directory: Path) -> list[dict]:
+        days = table.received_at.astype("datetime64[D]")
+        order = np.argsort(days, kind="stable")
+        table = table.take(order)
+        days = days[order]
+        bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+        partitions = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            part = table.take(slice(lo, hi))
+            name = f"day={days[lo]}"
+            save_columns(directory / name, part.columns())
+            save_columns(directory / name / "receptions", part.receptions.columns())
+            t = part.received_at.view(np.int64)
+            partitions.append({"name": name, "rows": int(hi - lo), "first_ns": int(t.min()), "last_ns": int(t.max())})
+        save_columns(directory / "events", table.events.columns())
+        return partitions
+
+    def partitions(
+        self, start: np.datetime64 | None = None, end: np.datetime64 | None = None, sources=None
+    ) -> list[Path]:
+        """Directories of the cached partitions overlapping ``[start, end)``."""
+        lo = np.iinfo(np.int64).min if start is None else int(np.datetime64(start, "ns").view(np.int64))
+        hi = np.iinfo(np.int64).max if end is None else int(np.datetime64(end, "ns").view(np.int64))
+        found = []
+        for name, entry in sorted(self.manifest["sources"].items()):
+            if sources is not None and name not in sources:
+                continue
+            for part in entry["partitions"]:
+                if part["last_ns"] >= lo and part["first_ns"] < hi:
+                    found.append(self.root / entry["directory"] / part["name"])
+        return found
+
+    def _update_sketches(self, partitions: list[dict]) -> None:
+        """Rebuild the day sketches of every local day that ``partitions`` may touch."""
+        if not partitions:
+            return
+        first = np.datetime64(min(p["first_ns"] for p in partitions), "ns") - _EST
+        last = np.datetime64(max(p["last_ns"] for p in partitions), "ns") - _EDT
+        days = np.arange(first.astype("datetime64[D]"), last.astype("datetime64[D]") + 1)
+        table = self.read(days[0] + _EDT, days[-1] + 1 + _EST)
+        local = table.local_days()
+        order = np.argsort(local, kind="stable")
+        bounds = np.searchsorted(local[order], np.r_[days, days[-1] + 1])
+        sketched = set(self.manifest["sketches"])
+        for day, lo, hi in zip(days, bounds[:-1], bounds[1:]):
+            directory = self.root / SKETCHES / f"day={day}"
+            shutil.rmtree(directory, ignore_errors=True)
+            if lo == hi:
+                sketched.discard(str(day))
+                continue
+            directory.mkdir(parents=True)
+            rows = order[lo:hi]
+            for channel in SKETCH_CHANNELS:
+                KLLSketch.of(getattr(table, channel)[rows]).save(directory / f"{channel}.npz")
+            sketched.add(str(day))
+        self.manifest["sketches"] = sorted(sketched)
+
+    def sketch(self, channel: str, start: np.datetime64 | None = None, end: np.datetime64 | None = None) -> KLLSketch:
+        """Quantile sketch of ``channel`` over the uplinks received in ``[start, end)``.
+
+        ``start`` and ``end`` are America/New_York wall-clock times, like the
+        days of the sketches.  Local days wholly inside the range come from
+        their stored sketches; the uplinks of a partly covered day at either
+        end are read and sketched afresh.  Uplinks repeated across exports
+        are counted once.
+        """
+        if channel not in SKETCH_CHANNELS:
+            raise KeyError(f"no sketches kept for {channel!r}")
+        start = None if start is None else np.datetime64(start, "ns")
+        end = None if end is None else np.datetime64(end, "ns")
+        days = np.array(self.manifest["sketches"], dtype="datetime64[D]")
+        # Whole days run from the first midnight at or after start to the last one at or before end.
+        first = None if start is None else start.astype("datetime64[D]") + (start.astype("datetime64[D]") < start)
+        last = None if end is None else end.astype("datetime64[D]")
+        if first is not None and last is not None and first >= last:
+            edges = [(start, end)]
+            whole = days[:0]
+        else:
+            edges = [(start, first)] if first is not None and start < first else []
+            if last is not None and last < end:
+                edges.append((last, end))
+            keep = np.ones(len(days), dtype=bool)
+            if first is not None:
+                keep &= days >= first
+            if last is not None:
+                keep &= days < last
+            whole = days[keep]
+        merged = KLLSketch()
+        for day in whole:
+            merged.merge(KLLSketch.load(self.root / SKETCHES / f"day={day}" / f"{channel}.npz"))
+        for lo, hi in edges:
+            table = self.read(lo + _EDT, hi + _EST)
+            local = table.local_received_at()
+            merged.update(getattr(table, channel)[(local >= lo) & (local < hi)])
+        return merged
+
+    def quantiles(self, channel: str, q, start=None, end=None):
+        """Approximate quantiles ``q`` of ``channel`` over a range of local time, see :meth:`sketch`."""
+        return self.sketch(channel, start, end).quantile(q)
+
+    def events(self, sources=None) -> EventTable:
+        """Annotation rows of the cached exports."""
+        events = [
+            EventTable(
+                **load_columns(self.root / e["directory"] / "events", EVENT_COLUMNS, mmap=False),
+                dictionary=self.dictionary,
+            )
+            for n, e in sorted(self.manifest["sources"].items())
+            if sources is None or n in sources
+        ]
+        return EventTable.concat(events) if events else EventTable.empty(self.dictionary)
+
+    def read(
+        self,
+        start: np.datetime64 | None = None,
+        end: np.datetime64 | None = None,
+        sources=None,
+        dedupe: bool = True,
+    ) -> UplinkTable:
+        """Uplinks received in ``[start, end)`` from the cached exports.
+
+        Overlapping exports repeat uplinks; with ``dedupe`` they are merged
+        (see :func:`~jamaica_bay.dedup.deduplicate`).
+        """
+        parts = [read_partition(p, self.dictionary) for p in self.partitions(start, end, sources)]
+        table = UplinkTable.concat(parts) if parts else UplinkTable.empty(self.dictionary)
+        table.events = self.events(sources)
+        if start is not None or end is not None:
+            t = table.received_at
+            keep = np.ones(len(table), dtype=bool)
+            if start is not None:
+                keep &= t >= np.datetime64(start, "ns")
+            if end is not None:
+                keep &= t < np.datetime64(end, "ns")
+            table = table.take(keep)
+        return deduplicate(table) if dedupe else table
+
+
+def read_partition(directory: Path, dictionary: Dictionary, mmap: bool = True) -> UplinkTable:
+    """Open one cached day partition; columns are memory-mapped by default.
+
+    ``dictionary`` is the one its identifier codes were written with.
+    """
+    receptions = ReceptionTable(**load_columns(directory / "receptions", RECEPTION_COLUMNS, mmap), dictionary=dictionary)
+    return UplinkTable(
+        **load_columns(directory, UplinkTable.column_names(), mmap),
+        receptions=receptions,
+        events=EventTable.empty(dictionary),
+        dictionary=dictionary,
+    )
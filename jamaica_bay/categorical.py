@@ -0,0 +1,94 @@
+"""Dictionary encoding of repeated strings.
+
+Identifiers such as ``rm-0002``, ``ngens-test-app`` and
+``floodnet-ltap-gw-5031395339664750`` repeat on every row.  Tables store them
+as int32 codes into a :class:`Dictionary`.  A dictionary only ever grows, so
+codes stay valid as more exports are loaded with it, and tables that share
+one dictionary can be filtered, grouped and concatenated on integer arrays
+alone.  Loading uses one process-wide :data:`DEFAULT_DICTIONARY` unless told
+otherwise; a dictionary can be saved next to data that was encoded with it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+
+class Dictionary:
+    """Append-only mapping between byte strings and dense int32 codes."""
+
+    def __init__(self, values=()):
+        self._values: list[bytes] = []
+        self._codes: dict[bytes, int] = {}
+        self._array: np.ndarray | None = None
+        for value in values:
+            self._add(value.encode() if isinstance(value, str) else bytes(value))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Dictionary({len(self)} values)"
+
+    def _add(self, value: bytes) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+            self._array = None
+        return code
+
+    @property
+    def values(self) -> np.ndarray:
+        """All values as a fixed-width bytes array, indexed by code."""
+        if self._array is None:
+            self._array = np.array(self._values, dtype=f"S{max(map(len, self._values), default=1)}")
+        return self._array
+
+    def add(self, value: str | bytes) -> int:
+        """Code of one value, adding it if it is unseen."""
+        return self._add(value.encode() if isinstance(value, str) else value)
+
+    def code(self, value: str | bytes) -> int:
+        """Code of ``value``, or -1 if it is not in the dictionary."""
+        return self._codes.get(value.encode() if isinstance(value, str) else value, -1)
+
+    def encode(self, strings: np.ndarray) -> np.ndarray:
+        """Codes of a bytes array, adding unseen values to the dictionary."""
+        uniques, inverse = np.unique(strings, return_inverse=True)
+        codes = np.array([self._add(bytes(u)) for u in uniques], dtype=np.int32)
+        return codes[inverse].reshape(np.shape(strings)) if uniques.size else np.empty(0, dtype=np.int32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Values of ``codes`` as a bytes array."""
+        return self.values[codes]
+
+    def translate(self, codes: np.ndarray, source: Dictionary) -> np.ndarray:
+        """Re-express ``codes`` of ``source`` as codes of this dictionary."""
+        if source is self:
+            return codes
+        mapping = np.array([self._add(v) for v in source._values], dtype=np.int32)
+        return mapping[codes] if mapping.size else codes.astype(np.int32)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Dictionary:
+        """Read a saved dictionary; a missing file is an empty dictionary."""
+        try:
+            with open(path) as fh:
+                return cls(json.load(fh)["values"])
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the dictionary atomically as JSON."""
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"values": [v.decode() for v in self._values]}, fh, indent=2)
+        os.replace(tmp, path)
+
+
+#: Dictionary used when a loader is not given one.
+DEFAULT_DICTIONARY = Dictionary()
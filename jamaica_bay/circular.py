@@ -0,0 +1,120 @@
+"""Circular statistics of wind direction.
+
+Directions are summarised by the sums of their unit vectors,
+``S = sum(sin(dir))`` and ``C = sum(cos(dir))`` over ``n`` samples.  The mean
+resultant length ``R = hypot(S, C) / n`` is 1 for a constant direction and
+near 0 for directions spread all round, and every statistic here is a
+function of ``S``, ``C`` and ``n``.  Sums add, so the same functions serve
+the bins of :class:`~jamaica_bay.resample.WindBins`, whole tables and the
+running sums of a :class:`DirectionStats`.
+
+Yamartino's single-pass estimator of the standard deviation of direction is
+
+    eps = sqrt(1 - R**2),  sigma_theta = asin(eps) * (1 + (2/sqrt(3) - 1) * eps**3)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_YAMARTINO = 2.0 / np.sqrt(3.0) - 1.0
+
+
+def mean_direction(sin_sum, cos_sum) -> np.ndarray:
+    """Direction of ``(sin_sum, cos_sum)`` in ``[0, 360)`` degrees; NaN for a zero vector."""
+    sin_sum = np.asarray(sin_sum, dtype=np.float64)
+    cos_sum = np.asarray(cos_sum, dtype=np.float64)
+    direction = np.atleast_1d(np.degrees(np.arctan2(sin_sum, cos_sum)) % 360.0)
+    # A tiny negative angle wraps to exactly 360.0 in floating point.
+    direction[direction == 360.0] = 0.0
+    direction[(sin_sum == 0) & (cos_sum == 0) | np.isnan(sin_sum)] = np.nan
+    return direction.reshape(np.shape(sin_sum))[()]
+
+
+def resultant_length(sin_sum, cos_sum, count) -> np.ndarray:
+    """Mean resultant length ``R`` in ``[0, 1]``; NaN without samples."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.hypot(sin_sum, cos_sum) / np.where(np.asarray(count) > 0, count, np.nan)
+    return np.minimum(r, 1.0)
+
+
+def circular_variance(sin_sum, cos_sum, count) -> np.ndarray:
+    """``1 - R``: 0 for a constant direction, up to 1."""
+    return 1.0 - resultant_length(sin_sum, cos_sum, count)
+
+
+def yamartino_sigma(sin_sum, cos_sum, count) -> np.ndarray:
+    """Yamartino standard deviation of direction, in degrees."""
+    r = resultant_length(sin_sum, cos_sum, count)
+    eps = np.sqrt(np.maximum(1.0 - r * r, 0.0))
+    return np.degrees(np.arcsin(eps) * (1.0 + _YAMARTINO * eps**3))
+
+
+class DirectionStats:
+    """Running direction (and optionally speed) sums for streaming use.
+
+    ``add`` and ``remove`` take scalars or arrays, so a trailing window can
+    be maintained by removing the samples that leave it.  Samples with a
+    missing direction, or a missing speed when speeds are given, are
+    skipped.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sin_sum = 0.0
+        self.cos_sum = 0.0
+        self.speed_sum = 0.0
+        self.u_sum = 0.0
+        self.v_sum = 0.0
+
+    def _sums(self, dir, speed):
+        rad = np.radians(np.atleast_1d(np.asarray(dir, dtype=np.float64)))
+        spd = np.ones_like(rad) if speed is None else np.atleast_1d(np.asarray(speed, dtype=np.float64))
+        ok = np.isfinite(rad) & np.isfinite(spd)
+        rad, spd = rad[ok], spd[ok]
+        sin, cos = np.sin(rad), np.cos(rad)
+        return ok.sum(), sin.sum(), cos.sum(), spd.sum(), -(spd * sin).sum(), -(spd * cos).sum()
+
+    def add(self, dir, speed=None) -> None:
+        n, s, c, total, u, v = self._sums(dir, speed)
+        self.count += int(n)
+        self.sin_sum += s
+        self.cos_sum += c
+        self.speed_sum += total
+        self.u_sum += u
+        self.v_sum += v
+
+    def remove(self, dir, speed=None) -> None:
+        """Undo an earlier :meth:`add` of the same samples."""
+        n, s, c, total, u, v = self._sums(dir, speed)
+        self.count -= int(n)
+        self.sin_sum -= s
+        self.cos_sum -= c
+        self.speed_sum -= total
+        self.u_sum -= u
+        self.v_sum -= v
+
+    def merge(self, other: DirectionStats) -> None:
+        self.count += other.count
+        self.sin_sum += other.sin_sum
+        self.cos_sum += other.cos_sum
+        self.speed_sum += other.speed_sum
+        self.u_sum += other.u_sum
+        self.v_sum += other.v_sum
+
+    @property
+    def mean_direction(self) -> float:
+        return float(mean_direction(self.sin_sum, self.cos_sum)) if self.count else float("nan")
+
+    @property
+    def circular_variance(self) -> float:
+        return float(circular_variance(self.sin_sum, self.cos_sum, self.count))
+
+    @property
+    def sigma_theta(self) -> float:
+        return float(yamartino_sigma(self.sin_sum, self.cos_sum, self.count))
+
+    @property
+    def steadiness(self) -> float:
+        """Resultant wind speed over mean speed; needs speeds to have been given."""
+        return float(np.hypot(self.u_sum, self.v_sum) / self.speed_sum) if self.speed_sum else float("nan")
@@ -0,0 +1,219 @@
+"""Uplink deduplication keyed on ``(device_id, f_cnt, counter epoch)``.
+
+The same uplink shows up more than once when exports overlap or when a
+device's frame is forwarded twice.  Duplicates are grouped with a vectorized
+open-addressing :class:`HashIndex` over packed 64-bit keys, so merging is a
+handful of linear NumPy passes and never builds per-row Python objects.
+
+Frame counters restart from zero when a device reboots.  Counter resets are
+detected per device and split its history into *epochs*, so frames from
+before and after a reboot that share an ``f_cnt`` are not merged.  A reset
+shows either as a large fall in ``f_cnt`` or, after a reboot too early for
+that, as an ``f_cnt`` received again long after its first copy.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .table import UplinkTable
+
+#: Largest backwards step in ``f_cnt`` still treated as out-of-order delivery
+#: rather than a counter reset.
+DEFAULT_MAX_ROLLBACK = 64
+#: Widest spread of the receive times of copies of one uplink.  Copies carry
+#: the network server's ``received_at``, so they agree exactly; anything
+#: under the ~93 s uplink interval will do.
+DEFAULT_REPEAT_SLACK = np.timedelta64(60, "s")
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer; spreads packed keys over the table."""
+    with np.errstate(over="ignore"):
+        z = keys.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class HashIndex:
+    """Open-addressing hash index from uint64 keys to dense ids.
+
+    Keys are inserted a whole array at a time.  Each linear-probing round
+    resolves, for every pending key, whether its current slot holds the same
+    key, is free to claim, or holds another key and must be probed past.
+    """
+
+    def __init__(self, capacity: int):
+        size = 1 << max(4, int(2 * max(capacity, 1) - 1).bit_length())
+        self._mask = np.uint64(size - 1)
+        self._keys = np.zeros(size, dtype=np.uint64)
+        self._used = np.zeros(size, dtype=bool)
+        self._ids = np.full(size, -1, dtype=np.int64)
+        self._capacity = size // 2
+        self.n_ids = 0
+
+    def insert(self, keys: np.ndarray) -> np.ndarray:
+        """Insert ``keys`` and return the id of each; equal keys share an id.
+
+        Keys not seen before get the next unused ids, from :attr:`n_ids`
+        up, in no particular order.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        if self.n_ids + keys.size > self._capacity:
+            self._grow(self.n_ids + keys.size)
+        return self._insert(keys)
+
+    def _insert(self, keys: np.ndarray, fixed_ids: np.ndarray | None = None) -> np.ndarray:
+        ids = np.full(keys.size, -1, dtype=np.int64)
+        slots = _mix(keys) & self._mask
+        pending = np.arange(keys.size)
+        while pending.size:
+            k, s = keys[pending], slots[pending]
+            free = ~self._used[s]
+            if free.any():
+                claim_slots, first = np.unique(s[free], return_index=True)
+                winners = np.flatnonzero(free)[first]
+                self._keys[claim_slots] = k[winners]
+                self._used[claim_slots] = True
+                if fixed_ids is None:
+                    self._ids[claim_slots] = np.arange(self.n_ids, self.n_ids + claim_slots.size)
+                    self.n_ids += claim_slots.size
+                else:
+                    self._ids[claim_slots] = fixed_ids[pending[winners]]
+            hit = self._keys[s] == k
+            ids[pending[hit]] = self._ids[s[hit]]
+            pending = pending[~hit]
+            slots[pending] = (slots[pending] + np.uint64(1)) & self._mask
+        return ids
+
+    def _grow(self, needed: int) -> None:
+        used = np.flatnonzero(self._used)
+        keys, ids, n_ids = self._keys[used], self._ids[used], self.n_ids
+        self.__init__(needed)
+        self._insert(keys, ids)
+        self.n_ids = n_ids
+
+
+def pack_keys(device: np.ndarray, epoch: np.ndarray, f_cnt: np.ndarray) -> np.ndarray:
+    """Pack 16-bit device codes, 16-bit epochs and 32-bit counters into uint64."""
+    if device.size and (device.max() > 0xFFFF or epoch.max() > 0xFFFF):
+        raise ValueError("device codes and counter epochs must fit in 16 bits")
+    return (
+        (device.astype(np.uint64) << np.uint64(48))
+        | (epoch.astype(np.uint64) << np.uint64(32))
+        | (f_cnt.astype(np.uint64) & np.uint64(0xFFFFFFFF))
+    )
+
+
+def counter_epochs(
+    device: np.ndarray,
+    received_at: np.ndarray,
+    f_cnt: np.ndarray,
+    max_rollback: int = DEFAULT_MAX_ROLLBACK,
+    deployment: np.ndarray | None = None,
+    slack: np.timedelta64 = DEFAULT_REPEAT_SLACK,
+) -> np.ndarray:
+    """Number each row's frame-counter epoch within its device.
+
+    Rows are ordered by device and ``received_at``; a new epoch starts
+    wherever ``f_cnt`` falls by more than ``max_rollback`` from the previous
+    frame of the same device, and wherever ``deployment`` (see
+    :meth:`UplinkTable.deployments`) changes.  An ``f_cnt`` received again
+    more than ``slack`` after its previous copy in the same epoch marks a
+    reboot too: the epoch then also starts at the last fall in ``f_cnt``
+    between the two.
+    """
+    order = np.lexsort((received_at, device))
+    if not order.size:
+        return np.zeros(0, dtype=np.int64)
+    dev, cnt = device[order], f_cnt[order].astype(np.int64)
+    t = np.asarray(received_at, dtype="datetime64[ns]")[order].view(np.int64)
+    same_device = np.r_[False, dev[1:] == dev[:-1]]
+    fall = same_device & (np.r_[0, np.diff(cnt)] < 0)
+    reset = fall & (np.r_[0, np.diff(cnt)] < -max_rollback)
+    if deployment is not None:
+        reset |= same_device & (np.r_[0, np.diff(deployment[order])] != 0)
+    resets = np.cumsum(reset)
+
+    # Repeats of one counter in an epoch, in time order; positions are in ``order``.
+    by_count = np.lexsort((t, cnt, resets, dev))
+    repeat = (
+        (dev[by_count[1:]] == dev[by_count[:-1]])
+        & (resets[by_count[1:]] == resets[by_count[:-1]])
+        & (cnt[by_count[1:]] == cnt[by_count[:-1]])
+        & (t[by_count[1:]] - t[by_count[:-1]] > int(np.timedelta64(slack, "ns").view(np.int64)))
+    )
+    if repeat.any():
+        earlier, later = by_count[:-1][repeat], by_count[1:][repeat]
+        falls = np.flatnonzero(fall)
+        last_fall = np.searchsorted(falls, later, side="right") - 1
+        between = last_fall >= 0
+        between[between] = falls[last_fall[between]] > earlier[between]
+        reset[falls[last_fall[between]]] = True
+        resets = np.cumsum(reset)
+    # Restart the epoch count at the first row of each device.
+    device_start = np.maximum.accumulate(np.where(same_device, 0, np.arange(order.size)))
+    sorted_epochs = resets - resets[device_start]
+    epochs = np.empty(order.size, dtype=np.int64)
+    epochs[order] = sorted_epochs
+    return epochs
+
+
+def uplink_ids(
+    device_id: np.ndarray,
+    received_at: np.ndarray,
+    f_cnt: np.ndarray,
+    deployment: np.ndarray | None = None,
+    max_rollback: int = DEFAULT_MAX_ROLLBACK,
+) -> np.ndarray:
+    """Dense uplink id of every row; the copies of one uplink share an id.
+
+    Ids run from 0 to the number of uplinks less one, in no particular
+    order; :func:`first_copies` gives the first row of each in row order.
+    """
+    _, device = np.unique(device_id, return_inverse=True)
+    epoch = counter_epochs(device, received_at, f_cnt, max_rollback, deployment)
+    return HashIndex(len(device)).insert(pack_keys(device, epoch, f_cnt))
+
+
+def first_copies(ids: np.ndarray) -> np.ndarray:
+    """Ascending positions of the first row of every id of :func:`uplink_ids`."""
+    return np.sort(_first_rows(ids))
+
+
+def _first_rows(ids: np.ndarray) -> np.ndarray:
+    first = np.full(ids.max(initial=-1) + 1, len(ids), dtype=np.int64)
+    np.minimum.at(first, ids, np.arange(len(ids)))
+    return first
+
+
+def deduplicate(table: UplinkTable, max_rollback: int = DEFAULT_MAX_ROLLBACK) -> UplinkTable:
+    """Merge duplicate uplinks, keeping the first copy of each.
+
+    Duplicates are rows with the same device, counter epoch and ``f_cnt``;
+    deployment notes in ``table.events`` also open new epochs.
+    The receptions of all copies are united on the kept row, with repeated
+    ``(uplink, gateway)`` receptions collapsed to one.
+    """
+    if not len(table):
+        return table
+    ids = uplink_ids(table.device_id, table.received_at, table.f_cnt, table.deployments(), max_rollback)
+    first = _first_rows(ids)
+    keep = np.sort(first)
+    new_row = np.empty(first.size, dtype=np.int64)
+    new_row[np.argsort(first)] = np.arange(first.size)
+
+    result = table.take(keep)
+    rc = table.receptions
+    uplink = new_row[ids[rc.uplink]]
+    # Gateway codes share the cache-wide dictionary, so they get 32 bits.
+    rc_keys = (uplink.astype(np.uint64) << np.uint64(32)) | rc.gateway.astype(np.uint64)
+    rc_ids = HashIndex(len(rc)).insert(rc_keys)
+    rc_first = np.full(rc_ids.max(initial=-1) + 1, len(rc), dtype=np.int64)
+    np.minimum.at(rc_first, rc_ids, np.arange(len(rc)))
+    rc_keep = np.sort(rc_first)
+    receptions = rc.take(rc_keep)
+    receptions.uplink = uplink[rc_keep]
+    result.receptions = receptions
+    return result
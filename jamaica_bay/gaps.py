@@ -0,0 +1,251 @@
+"""Frame loss and outages from ``f_cnt`` discontinuities.
+
+A device numbers its uplinks with ``f_cnt``, one count per frame, so when
+the frames of one counter epoch (see :func:`~jamaica_bay.dedup.counter_epochs`)
+are sorted by ``f_cnt``, a step of ``s > 1`` between neighbours means
+``s - 1`` frames never arrived: 182092 -> 182102 lost nine.  Sorting by the
+counter rather than by ``received_at`` keeps late frames from being counted
+as lost and then received.  A counter reset or a new deployment starts a new
+epoch; the frames lost across it are unknown, so it is recorded as a gap with
+``lost = -1``.
+
+A :class:`GapIndex` holds one row per gap: device, the receive times of the
+frames on either side, and the frames lost.  Its :meth:`~GapIndex.segments`
+number the stretches between gaps, which is what the rolling statistics of
+:mod:`jamaica_bay.rolling` use to keep windows from reaching back across an
+outage, and :meth:`~GapIndex.overlaps` flags the resampling bins an outage
+runs through.  Every lost frame is a gap; for rolling windows, pass the
+longer ones, e.g. ``gaps.outages(min_lost=5)``.  An index is saved as one
+``.npz`` file, replaced atomically.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .dedup import DEFAULT_MAX_ROLLBACK, counter_epochs
+from .resample import parse_interval
+from .table import UplinkTable, _default_dictionary
+from .timestamps import NAT, NS_PER_SECOND, eastern_utc_offset
+
+#: Lower edges of the gap-length classes, in lost frames; the last is open-ended.
+DEFAULT_GAP_EDGES = (1, 2, 3, 5, 10, 20, 50, 100)
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class GapIndex:
+    """Frame-counter gaps, ordered by device and ``start``.
+
+    ``start`` and ``end`` are the ``received_at`` of the last frame before
+    and the first frame after the gap; ``lost`` is -1 for a counter reset.
+    """
+
+    device_id: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    lost: np.ndarray
+    dictionary: Dictionary = field(default_factory=_default_dictionary, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+    @property
+    def resets(self) -> np.ndarray:
+        return self.lost < 0
+
+    def take(self, index) -> GapIndex:
+        return GapIndex(self.device_id[index], self.start[index], self.end[index], self.lost[index], self.dictionary)
+
+    def outages(self, min_lost: int = 1, min_duration=None) -> GapIndex:
+        """Gaps of at least ``min_lost`` frames and ``min_duration``; resets are always kept."""
+        keep = self.resets | (self.lost >= min_lost)
+        if min_duration is not None:
+            keep &= self.duration >= parse_interval(min_duration)
+        return self.take(keep)
+
+    def histogram(self, edges=DEFAULT_GAP_EDGES) -> np.ndarray:
+        """Number of gaps per length class; class ``k`` holds ``edges[k] <= lost < edges[k+1]``.
+
+        Resets, whose length is unknown, and gaps shorter than ``edges[0]``
+        are not counted.
+        """
+        lost = self.lost[self.lost >= edges[0]]
+        return np.bincount(np.searchsorted(edges, lost, side="right") - 1, minlength=len(edges))
+
+    def segments(self, device_id: np.ndarray, received_at: np.ndarray) -> np.ndarray:
+        """Number of the device's gaps ending at or before each ``received_at``.
+
+        Uplinks of one device share a segment exactly when no gap lies
+        between them.
+        """
+        device_id = np.asarray(device_id)
+        received_at = np.asarray(received_at, dtype="datetime64[ns]")
+        segment = np.zeros(len(received_at), dtype=np.int64)
+        for device in np.unique(self.device_id):
+            rows = device_id == device
+            ends = np.sort(self.end[self.device_id == device])
+            segment[rows] = np.searchsorted(ends, received_at[rows], side="right")
+        return segment
+
+    def overlaps(self, starts, ends, device_id: int | None = None) -> np.ndarray:
+        """Whether each interval ``[start, end)`` meets a gap of ``device_id`` (default: any device).
+
+        An interval meets a gap when it overlaps the open span between the
+        frames on either side of it.
+        """
+        starts = np.asarray(starts, dtype="datetime64[ns]")
+        ends = np.asarray(ends, dtype="datetime64[ns]")
+        hits = np.zeros(starts.shape, dtype=np.int64)
+        devices = np.unique(self.device_id) if device_id is None else [device_id]
+        for device in devices:
+            rows = self.device_id == device
+            # Gaps of one device do not overlap, so their starts and ends sort alike.
+            begun = np.searchsorted(np.sort(self.start[rows]), ends, side="left")
+            over = np.searchsorted(np.sort(self.end[rows]), starts, side="right")
+            hits += begun - over
+        return hits > 0
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, dictionary: Dictionary = DEFAULT_DICTIONARY) -> GapIndex:
+        """Read a saved index, encoding its device names into ``dictionary``."""
+        with np.load(path, allow_pickle=False) as saved:
+            if int(saved["format"]) != FORMAT_VERSION:
+                raise ValueError(f"unsupported gap index format {int(saved['format'])!r}")
+            codes = dictionary.encode(saved["devices"])[saved["device_id"]]
+            return cls(codes.astype(np.int32), saved["start"], saved["end"], saved["lost"], dictionary)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the index; devices are stored by name, not by code."""
+        devices, device_id = np.unique(self.device_id, return_inverse=True)
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                format=np.int64(FORMAT_VERSION),
+                devices=self.dictionary.decode(devices),
+                device_id=device_id.astype(np.int64),
+                start=self.start,
+                end=self.end,
+                lost=self.lost,
+            )
+        os.replace(tmp, path)
+
+
+@dataclass
+class Delivery:
+    """Frames received and lost per regular interval; bins start at multiples of ``interval``.
+
+    A gap's lost frames are spread evenly over the time between the frames
+    on either side of it.  Frames lost across counter resets are unknown and
+    not counted.
+    """
+
+    start: np.ndarray
+    interval: np.timedelta64
+    received: np.ndarray
+    lost: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def expected(self) -> np.ndarray:
+        return self.received + self.lost
+
+    @property
+    def ratio(self) -> np.ndarray:
+        """Received over expected frames; NaN for bins expecting none."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.received / self.expected
+
+
+def _frames(table: UplinkTable, max_rollback: int):
+    """Rows of ``table`` in ``(device, epoch, f_cnt)`` order, with their epochs."""
+    epoch = counter_epochs(table.device_id, table.received_at, table.f_cnt, max_rollback, table.deployments())
+    order = np.lexsort((table.received_at, table.f_cnt, epoch, table.device_id))
+    return order, epoch[order]
+
+
+def frame_gaps(table: UplinkTable, max_rollback: int = DEFAULT_MAX_ROLLBACK) -> GapIndex:
+    """Index the frame-counter gaps and resets of every device in ``table``.
+
+    Duplicate frames are harmless, so the table need not be deduplicated.
+    """
+    order, epoch = _frames(table, max_rollback)
+    device = table.device_id[order]
+    f_cnt = table.f_cnt[order].astype(np.int64)
+    received_at = table.received_at[order]
+    same_device = device[1:] == device[:-1]
+    reset = same_device & (epoch[1:] != epoch[:-1])
+    step = np.diff(f_cnt)
+    gap = np.flatnonzero(reset | same_device & (step > 1))
+    return GapIndex(
+        device_id=device[gap + 1],
+        start=received_at[gap],
+        end=received_at[gap + 1],
+        lost=np.where(reset[gap], -1, step[gap] - 1),
+        dictionary=table.dictionary,
+    )
+
+
+def delivery(
+    table: UplinkTable,
+    interval="1h",
+    gaps: GapIndex | None = None,
+    fill: bool = True,
+    max_rollback: int = DEFAULT_MAX_ROLLBACK,
+    local: bool = True,
+) -> Delivery:
+    """Delivery ratio over ``interval`` bins (``"1h"``, ``"1d"``, ...) of all devices in ``table``.
+
+    ``gaps`` defaults to :func:`frame_gaps` of ``table``.  Duplicate frames
+    are received once.  With ``fill`` the bins form a gapless grid from the
+    first to the last frame.  With ``local`` the bins, and their ``start``,
+    follow the America/New_York wall clock, so daily bins are the local days
+    of :class:`~jamaica_bay.rose.DailyRoses` and
+    :func:`~jamaica_bay.weibull.weibull_climatology`; otherwise they are UTC.
+    """
+    step = parse_interval(interval).view(np.int64)
+    if not len(table):
+        empty = np.empty(0, dtype=np.int64)
+        return Delivery(empty.view("datetime64[ns]"), np.timedelta64(step, "ns"), empty, empty)
+    if gaps is None:
+        gaps = frame_gaps(table, max_rollback)
+    order, epoch = _frames(table, max_rollback)
+    device = table.device_id[order]
+    f_cnt = table.f_cnt[order]
+    repeat = np.r_[False, (device[1:] == device[:-1]) & (epoch[1:] == epoch[:-1]) & (f_cnt[1:] == f_cnt[:-1])]
+    received_at = table.local_received_at() if local else table.received_at
+    received_keys = received_at[order][~repeat].view(np.int64) // step
+
+    # Lost frame j of a gap of n sits j / (n + 1) of the way across it.
+    known = ~gaps.resets
+    n = gaps.lost[known]
+    t0 = gaps.start[known].view(np.int64)
+    span = (gaps.end[known].view(np.int64) - t0).astype(np.float64)
+    which = np.repeat(np.arange(n.size), n)
+    j = np.arange(which.size) - np.repeat(np.cumsum(n) - n, n) + 1
+    lost_at = (t0[which] + span[which] * j / (n[which] + 1)).astype(np.int64)
+    if local:
+        offset = eastern_utc_offset(np.full(lost_at.shape, NAT), lost_at)
+        lost_at += offset.astype(np.int64) * NS_PER_SECOND
+    lost_keys = lost_at // step
+
+    keys = np.concatenate([received_keys, lost_keys])
+    if fill:
+        bins = np.arange(keys.min(), keys.max() + 1)
+    else:
+        bins = np.unique(keys)
+    received = np.bincount(np.searchsorted(bins, received_keys), minlength=len(bins))
+    lost = np.bincount(np.searchsorted(bins, lost_keys), minlength=len(bins))
+    return Delivery((bins * step).view("datetime64[ns]"), np.timedelta64(step, "ns"), received, lost)
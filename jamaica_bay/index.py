@@ -0,0 +1,109 @@
+"""Sorted time index for many small window lookups.
+
+A :class:`TimeIndex` keeps the uplink columns sorted by ``received_at`` and
+the receptions sorted by gateway ``time``.  A window is then two binary
+searches, ``O(log n)``, and its rows are a contiguous slice: the columns of a
+window are views of the indexed arrays, not copies picked out by a boolean
+mask over the whole history.  Windows are looked up in bulk with
+:meth:`TimeIndex.spans`, for example the half hour before each of a few
+thousand gusts::
+
+    lo, hi = index.spans(gusts - np.timedelta64(30, "m"), gusts)
+
+An index is saved as ``.npy`` files and opened memory-mapped::
+
+    <root>/dictionary.json
+    <root>/uplinks/received_at.npy speed.npy ...
+    <root>/receptions/time.npy uplink.npy ...
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .cache import load_columns, save_columns
+from .categorical import Dictionary
+from .table import ReceptionTable, UplinkTable
+
+
+class TimeIndex:
+    """Uplinks sorted by ``received_at`` and receptions sorted by gateway time.
+
+    ``receptions["uplink"]`` holds row positions in the sorted uplinks.
+    Receptions without a gateway time sort last.
+    """
+
+    def __init__(self, uplinks: dict[str, np.ndarray], receptions: dict[str, np.ndarray], dictionary: Dictionary):
+        self.uplinks = uplinks
+        self.receptions = receptions
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.uplinks["received_at"])
+
+    @classmethod
+    def build(cls, table: UplinkTable) -> TimeIndex:
+        """Index ``table``; rows with equal ``received_at`` keep their order."""
+        order = np.argsort(table.received_at, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        rc = table.receptions
+        rc_order = np.argsort(rc.time, kind="stable")
+        receptions = {name: col[rc_order] for name, col in rc.columns().items()}
+        receptions["uplink"] = rank[receptions["uplink"]]
+        return cls({name: col[order] for name, col in table.columns().items()}, receptions, table.dictionary)
+
+    @classmethod
+    def load(cls, root: str | os.PathLike, mmap: bool = True) -> TimeIndex:
+        """Open a saved index; columns are memory-mapped by default."""
+        root = Path(root)
+        return cls(
+            load_columns(root / "uplinks", UplinkTable.column_names(), mmap),
+            load_columns(root / "receptions", ReceptionTable.column_names(), mmap),
+            Dictionary.load(root / "dictionary.json"),
+        )
+
+    def save(self, root: str | os.PathLike) -> None:
+        root = Path(root)
+        save_columns(root / "uplinks", self.uplinks)
+        save_columns(root / "receptions", self.receptions)
+        self.dictionary.save(root / "dictionary.json")
+
+    @property
+    def received_at(self) -> np.ndarray:
+        return self.uplinks["received_at"]
+
+    def spans(self, starts, ends) -> tuple[np.ndarray, np.ndarray]:
+        """Row bounds ``lo, hi`` of the uplinks received in each ``[start, end)``."""
+        return _spans(self.received_at, starts, ends)
+
+    def span(self, start, end) -> slice:
+        """Rows of the uplinks received in ``[start, end)``."""
+        lo, hi = self.spans([start], [end])
+        return slice(int(lo[0]), int(hi[0]))
+
+    def window(self, start, end, names=None) -> dict[str, np.ndarray]:
+        """Views of the uplink columns ``names`` (default: all) in ``[start, end)``."""
+        rows = self.span(start, end)
+        return {name: self.uplinks[name][rows] for name in names or self.uplinks}
+
+    def gateway_spans(self, starts, ends) -> tuple[np.ndarray, np.ndarray]:
+        """Row bounds of the receptions whose gateway ``time`` is in each ``[start, end)``."""
+        return _spans(self.receptions["time"], starts, ends)
+
+    def gateway_window(self, start, end, names=None) -> dict[str, np.ndarray]:
+        """Views of the reception columns ``names`` (default: all) in ``[start, end)``."""
+        lo, hi = self.gateway_spans([start], [end])
+        rows = slice(int(lo[0]), int(hi[0]))
+        return {name: self.receptions[name][rows] for name in names or self.receptions}
+
+
+def _spans(times: np.ndarray, starts, ends) -> tuple[np.ndarray, np.ndarray]:
+    starts = np.asarray(starts, dtype="datetime64[ns]")
+    ends = np.asarray(ends, dtype="datetime64[ns]")
+    lo = np.searchsorted(times, starts, side="left")
+    hi = np.searchsorted(times, ends, side="left")
+    return lo, np.maximum(hi, lo)
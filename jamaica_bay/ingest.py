@@ -0,0 +1,186 @@
+"""Incremental ingest of overlapping exports against a persisted watermark.
+
+Successive exports overlap: each new dump repeats days already seen in the
+previous one.  A :class:`Watermark` remembers, per ``device_id``, the latest
+``received_at`` and ``f_cnt`` already ingested.  :func:`read_new` bisects the
+export on disk to the first line that can be newer than the watermark and
+parses only that tail, so the cost of an ingest follows the number of new
+rows rather than the size of the export.  A device the watermark does not
+know yet has no such bound: when one shows up in the first rows or in the
+tail, the whole export is parsed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .loader import parse_buffer, parse_columns
+from .schema import SNIFF_BYTES, sniff
+from .stream import record_end
+from .table import UplinkTable
+
+#: Exports are ordered by arrival, but ``received_at`` can run a few minutes
+#: backwards where the network delivered late; bisection backs off this far.
+DEFAULT_SLACK = np.timedelta64(1, "h")
+
+_PROBE_BYTES = 4096
+
+
+@dataclass
+class Watermark:
+    """Latest ``(received_at ns, f_cnt)`` ingested for each device."""
+
+    devices: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Watermark:
+        """Read a watermark file; a missing file is an empty watermark."""
+        try:
+            with open(path) as fh:
+                state = json.load(fh)
+        except FileNotFoundError:
+            return cls()
+        return cls({dev: (int(v["received_at_ns"]), int(v["f_cnt"])) for dev, v in state["devices"].items()})
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the watermark atomically."""
+        state = {"devices": {dev: {"received_at_ns": t, "f_cnt": f} for dev, (t, f) in sorted(self.devices.items())}}
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp, path)
+
+    def floor(self) -> np.datetime64 | None:
+        """Earliest per-device ``received_at``.
+
+        No row of a known device received before it can be new; rows of
+        devices missing from the watermark can be new anywhere.
+        """
+        if not self.devices:
+            return None
+        return np.datetime64(min(t for t, _ in self.devices.values()), "ns")
+
+    def knows(self, device_id: np.ndarray, dictionary: Dictionary = DEFAULT_DICTIONARY) -> bool:
+        """Whether every device code in ``device_id`` has a watermark."""
+        return all(dictionary.values[code].decode() in self.devices for code in np.unique(device_id))
+
+    def is_new(self, table: UplinkTable) -> np.ndarray:
+        """Mask of rows past the watermark of their device.
+
+        A row is new if it was received after the device's watermark or
+        carries a higher frame counter, which keeps late deliveries that
+        arrive with a slightly older ``received_at``.
+        """
+        new = np.ones(len(table), dtype=bool)
+        t = table.received_at.view(np.int64)
+        for dev, (wm_t, wm_f) in self.devices.items():
+            rows = table.device_id == table.device_code(dev)
+            new[rows] = (t[rows] > wm_t) | (table.f_cnt[rows] > wm_f)
+        return new
+
+    def advance(self, table: UplinkTable) -> None:
+        """Move each device's watermark past the rows of ``table``."""
+        t = table.received_at.view(np.int64)
+        for code in np.unique(table.device_id):
+            rows = table.device_id == code
+            key = table.dictionary.values[code].decode()
+            wm_t, wm_f = self.devices.get(key, (np.iinfo(np.int64).min, -1))
+            self.devices[key] = (max(wm_t, int(t[rows].max())), max(wm_f, int(table.f_cnt[rows].max())))
+
+
+def read_new(path: str | os.PathLike, watermark: Watermark, slack: np.timedelta64 = DEFAULT_SLACK) -> UplinkTable:
+    """Parse the rows of ``path`` that lie past ``watermark``.
+
+    Only the tail from the watermark's :meth:`~Watermark.floor` on is parsed,
+    unless the first rows or that tail hold a device without a watermark.
+    A device whose rows all lie between the two goes unnoticed.
+    """
+    floor = watermark.floor()
+    with open(path, "rb") as fh:
+        head = fh.read(SNIFF_BYTES)
+        schema, _ = sniff(head)
+        offset = 0
+        if floor is not None:
+            head_devices = parse_columns(head[: record_end(head)], ["device_id"], schema)[0]["device_id"]
+            if watermark.knows(head_devices):
+                offset = tail_offset(fh, floor - slack, schema.fields["received_at"])
+        fh.seek(offset)
+        table = parse_buffer(fh.read(), schema)
+        if offset and not watermark.knows(table.device_id, table.dictionary):
+            fh.seek(0)
+            table = parse_buffer(fh.read(), schema)
+    return table.take(watermark.is_new(table))
+
+
+def ingest(path: str | os.PathLike, state_path: str | os.PathLike) -> UplinkTable:
+    """Read the new rows of ``path`` and persist the advanced watermark."""
+    watermark = Watermark.load(state_path)
+    table = read_new(path, watermark)
+    if len(table):
+        watermark.advance(table)
+        watermark.save(state_path)
+    return table
+
+
+def tail_offset(fh, since: np.datetime64, column: int) -> int:
+    """Byte offset of the first line of ``fh`` received at or after ``since``.
+
+    ``column`` is the position of ``received_at``.  Bisects on line starts,
+    reading one small probe per step.  Returns 0 when the whole file may be
+    needed.
+    """
+    lo, _ = _bisect(fh, since, column)
+    start, _ = _line_after(fh, lo, column) if lo else (0, None)
+    return start if start is not None else lo
+
+
+def head_offset(fh, until: np.datetime64, column: int) -> int:
+    """Byte offset of a line of ``fh`` from which on lines are received at or after ``until``.
+
+    The counterpart of :func:`tail_offset`: everything received before
+    ``until`` lies in front of it, give or take unsorted rows.  Returns the
+    file size when no such line is found.
+    """
+    size = fh.seek(0, os.SEEK_END)
+    _, hi = _bisect(fh, until, column)
+    if hi >= size:
+        return size
+    start, _ = _line_after(fh, hi, column)
+    return start if start is not None else size
+
+
+def _bisect(fh, since: np.datetime64, column: int) -> tuple[int, int]:
+    """Narrow down to a probe-sized span the place where ``since`` falls."""
+    size = fh.seek(0, os.SEEK_END)
+    lo, hi = 0, size
+    while hi - lo > _PROBE_BYTES:
+        mid = (lo + hi) // 2
+        start, t = _line_after(fh, mid, column)
+        if start is None or t is None or t >= since:
+            hi = mid
+        else:
+            lo = mid
+    return lo, hi
+
+
+def _line_after(fh, offset: int, column: int) -> tuple[int | None, np.datetime64 | None]:
+    """Return the start and ``received_at`` of the first line after ``offset``."""
+    fh.seek(offset)
+    probe = fh.read(_PROBE_BYTES)
+    nl = probe.find(b"\n")
+    if nl < 0:
+        return None, None
+    line = probe[nl + 1 :].split(b"\n", 1)[0]
+    fields = line.split(b",", column + 1)
+    if len(fields) <= column:
+        return offset + nl + 1, None
+    try:
+        t = np.datetime64(fields[column].rstrip(b"Z").decode(), "ns")
+    except ValueError:
+        t = None
+    return offset + nl + 1, t
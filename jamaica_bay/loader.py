@@ -0,0 +1,200 @@
+"""Load ``jamaica_bay_*.csv`` uplink exports into typed NumPy columns.
+
+The column layout comes from :mod:`jamaica_bay.schema`; the whole file is
+then tokenized and decoded in one vectorized pass, see :mod:`jamaica_bay._csv`.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from . import _csv
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .schema import SNIFF_BYTES, ExportSchema, sniff
+from .table import MISSING_RSSI, EventTable, ReceptionTable, UplinkTable
+from .timestamps import eastern_utc_offset, parse_local_time, parse_rfc3339
+
+
+def load_export(
+    path: str | os.PathLike, schema: ExportSchema | None = None, dictionary: Dictionary = DEFAULT_DICTIONARY
+) -> UplinkTable:
+    """Read and parse one export file."""
+    with open(path, "rb") as fh:
+        return parse_buffer(fh.read(), schema, dictionary)
+
+
+def parse_buffer(
+    data: bytes, schema: ExportSchema | None = None, dictionary: Dictionary = DEFAULT_DICTIONARY
+) -> UplinkTable:
+    """Parse the bytes of an export, with or without its header row.
+
+    The layout is sniffed from the first bytes unless ``schema`` is given.
+    Rows whose ``f_cnt`` is not an integer are annotations rather than
+    uplinks; they are diverted to the table's ``events``.  Identifiers are
+    encoded into ``dictionary``.
+    """
+    buf, starts, ends, schema, events = _split_rows(data, schema, dictionary)
+    return UplinkTable(
+        **decode_columns(buf, starts, ends, schema, UplinkTable.column_names(), dictionary),
+        receptions=parse_receptions(buf, starts, ends, schema, dictionary),
+        events=events,
+        dictionary=dictionary,
+    )
+
+
+def parse_columns(
+    data: bytes, names, schema: ExportSchema | None = None, dictionary: Dictionary = DEFAULT_DICTIONARY
+) -> tuple[dict[str, np.ndarray], EventTable]:
+    """Like :func:`parse_buffer`, but decode only the uplink columns ``names``.
+
+    Rows are still tokenized in full; the saving is in skipping the other
+    columns and the receptions, which cost more than all uplink columns
+    together.  Returns the columns and the annotation rows.
+    """
+    buf, starts, ends, schema, events = _split_rows(data, schema, dictionary)
+    return decode_columns(buf, starts, ends, schema, names, dictionary), events
+
+
+def _split_rows(data: bytes, schema: ExportSchema | None, dictionary: Dictionary):
+    """Tokenize ``data`` and divert its annotation rows to an event table."""
+    if schema is None:
+        schema, _ = sniff(bytes(data[:SNIFF_BYTES]))
+    if bytes(data[: len(schema.header_line)]) == schema.header_line:
+        # A header without a newline is a header-only export: no rows.
+        newline = bytes(data[:SNIFF_BYTES]).find(b"\n")
+        data = memoryview(data)[len(data) if newline < 0 else newline + 1 :]
+    buf = _csv.as_buffer(data)
+    starts, ends = _csv.tokenize(buf, schema.n_fields)
+
+    f_cnt = schema.fields["f_cnt"]
+    uplink = _csv.is_digits(buf, starts[:, f_cnt], ends[:, f_cnt])
+    events = parse_events(buf, starts[~uplink], ends[~uplink], schema, dictionary)
+    return buf, starts[uplink], ends[uplink], schema, events
+
+
+def decode_columns(
+    buf: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    schema: ExportSchema,
+    names,
+    dictionary: Dictionary = DEFAULT_DICTIONARY,
+) -> dict[str, np.ndarray]:
+    """Decode the :class:`UplinkTable` columns ``names`` of tokenized uplink rows."""
+
+    def col(name):
+        i = schema.fields[name]
+        return starts[:, i], ends[:, i]
+
+    names = list(names)
+    unknown = set(names) - set(UplinkTable.column_names())
+    if unknown:
+        raise KeyError(f"unknown uplink columns: {sorted(unknown)}")
+    received_at = local_time = None
+    if {"received_at", "utc_offset"} & set(names):
+        received_at = parse_rfc3339(buf, *col("received_at"))
+    if {"local_time", "utc_offset"} & set(names):
+        local_time = parse_local_time(buf, *col("local_time"))
+
+    out = {}
+    for name in names:
+        if name in ("device_id", "application_id"):
+            out[name] = dictionary.encode(_csv.parse_strings(buf, *col(name)))
+        elif name == "received_at":
+            out[name] = received_at.view("datetime64[ns]")
+        elif name == "local_time":
+            out[name] = local_time.view("datetime64[ns]")
+        elif name == "utc_offset":
+            out[name] = (eastern_utc_offset(local_time, received_at) // 60).astype(np.int16)
+        elif name == "f_cnt":
+            out[name] = _csv.parse_int(buf, *col(name))
+        else:
+            out[name] = _csv.parse_float(buf, *col(name))
+    return out
+
+
+def parse_events(
+    buf: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    schema: ExportSchema,
+    dictionary: Dictionary = DEFAULT_DICTIONARY,
+) -> EventTable:
+    """Decode annotation rows: their note text and an optional ``"lat, lon"``.
+
+    A comma-bearing field that is not two plain decimal numbers is kept as
+    ``location`` text with NaN coordinates.
+    """
+    if not len(starts):
+        return EventTable.empty(dictionary)
+
+    def col(name):
+        i = schema.fields[name]
+        return starts[:, i], ends[:, i]
+
+    # The location is the first field after the note that contains a comma.
+    after = np.arange(schema.n_fields) > schema.fields["f_cnt"]
+    fields = np.char.strip(_csv.as_bytes(_csv.field_matrix(buf, starts[:, after].ravel(), ends[:, after].ravel())))
+    fields = fields.reshape(len(starts), -1)
+    has_comma = np.char.find(fields, b",") >= 0
+    location = fields[np.arange(len(starts)), np.argmax(has_comma, axis=1)]
+    location = np.where(has_comma.any(axis=1), location, b"")
+    lat, _, lon = np.char.strip(np.char.partition(location, b",")).T
+    numeric = _csv.is_decimal(lat) & _csv.is_decimal(lon)
+    latitude = np.full(len(starts), np.nan)
+    longitude = np.full(len(starts), np.nan)
+    latitude[numeric] = lat[numeric].astype(np.float64)
+    longitude[numeric] = lon[numeric].astype(np.float64)
+
+    return EventTable(
+        device_id=dictionary.encode(_csv.parse_strings(buf, *col("device_id"))),
+        received_at=parse_timestamps(buf, *col("received_at")),
+        local_time=parse_local_time(buf, *col("local_time")).view("datetime64[ns]"),
+        text=np.char.strip(_csv.parse_strings(buf, *col("f_cnt"))),
+        location=location,
+        latitude=latitude,
+        longitude=longitude,
+        dictionary=dictionary,
+    )
+
+
+def parse_receptions(
+    buf: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    schema: ExportSchema,
+    dictionary: Dictionary = DEFAULT_DICTIONARY,
+) -> ReceptionTable:
+    """Explode the reception groups of tokenized rows into a long table.
+
+    Empty groups are skipped; receptions come out ordered by uplink, then by
+    group position.
+    """
+    groups = np.array(schema.reception_groups)
+    n_groups = len(groups)
+
+    def group(k):
+        return starts[:, groups[:, k]].ravel(), ends[:, groups[:, k]].ravel()
+
+    gtw_starts, gtw_ends = group(0)
+    present = np.flatnonzero(gtw_ends > gtw_starts)
+
+    def col(k):
+        s, e = group(k)
+        return s[present], e[present]
+
+    return ReceptionTable(
+        uplink=present // n_groups,
+        gateway=dictionary.encode(_csv.parse_strings(buf, *col(0))),
+        time=parse_timestamps(buf, *col(1)),
+        rssi=_csv.parse_int(buf, *col(2), fill=MISSING_RSSI, dtype=np.int16),
+        snr=_csv.parse_float(buf, *col(3)),
+        dictionary=dictionary,
+    )
+
+
+def parse_timestamps(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Decode RFC 3339 UTC timestamps to ``datetime64[ns]``; empty fields are NaT."""
+    return parse_rfc3339(buf, starts, ends).view("datetime64[ns]")
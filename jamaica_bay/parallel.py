@@ -0,0 +1,159 @@
+"""Parallel ingest of many exports on a process pool.
+
+Every export, or every byte range of a large one, is parsed in a worker
+process.  Workers hand their columns back through
+:mod:`multiprocessing.shared_memory` blocks instead of pickling them, and the
+parent merges the parts into one table ordered by ``received_at``.  Parts
+come back nearly sorted, so the merge is a stable sort over ``k`` presorted
+runs, which NumPy's timsort handles in ``O(n log k)``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .dedup import deduplicate
+from .loader import parse_buffer
+from .schema import SNIFF_BYTES, ExportSchema, sniff
+from .table import EventTable, ReceptionTable, UplinkTable
+
+#: Exports larger than this are split into byte ranges parsed separately.
+DEFAULT_SPLIT_BYTES = 64 << 20
+
+_PROBE_BYTES = 1 << 16
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """A column left in a named shared-memory block by a worker."""
+
+    name: str
+    dtype: str
+    length: int
+
+    @classmethod
+    def publish(cls, values: np.ndarray) -> SharedColumn:
+        values = np.ascontiguousarray(values)
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+        shm.close()
+        # The parent owns the block from here on and unlinks it after reading.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm.name, values.dtype.str, len(values))
+
+    def take(self) -> np.ndarray:
+        """Copy the column out of shared memory and release the block."""
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return np.ndarray((self.length,), dtype=np.dtype(self.dtype), buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+@dataclass(frozen=True)
+class SharedPart:
+    """A parsed export range: shared columns plus its small side tables.
+
+    Identifier codes refer to the worker's ``dictionary``.
+    """
+
+    columns: dict[str, SharedColumn]
+    receptions: dict[str, SharedColumn]
+    events: EventTable
+    dictionary: Dictionary
+
+    def load(self, dictionary: Dictionary = DEFAULT_DICTIONARY) -> UplinkTable:
+        """Take the columns, translating codes into ``dictionary``."""
+        receptions = ReceptionTable(**{k: c.take() for k, c in self.receptions.items()}, dictionary=self.dictionary)
+        table = UplinkTable(
+            **{k: c.take() for k, c in self.columns.items()},
+            receptions=receptions,
+            events=self.events,
+            dictionary=self.dictionary,
+        )
+        return table.recode(dictionary)
+
+
+def split_ranges(path: str | os.PathLike, schema: ExportSchema, n_parts: int) -> list[tuple[int, int]]:
+    """Cut ``path`` into about ``n_parts`` byte ranges at record boundaries.
+
+    A cut is placed after a newline whose next line parses as a record of
+    ``schema``, which keeps newlines inside quoted fields from being used.
+    """
+    size = os.path.getsize(path)
+    cuts = [0]
+    with open(path, "rb") as fh:
+        for k in range(1, n_parts):
+            target = max(size * k // n_parts, cuts[-1])
+            fh.seek(target)
+            probe = fh.read(_PROBE_BYTES)
+            pos = 0
+            while True:
+                nl = probe.find(b"\n", pos)
+                if nl < 0:
+                    break
+                line = probe[nl + 1 :].split(b"\n", 1)[0]
+                row = next(csv.reader(io.StringIO(line.decode("utf-8", "replace"))), [])
+                if schema.matches_row(row):
+                    cuts.append(target + nl + 1)
+                    break
+                pos = nl + 1
+    cuts.append(size)
+    cuts = sorted(set(cuts))
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _parse_part(path: str, start: int, stop: int, schema: ExportSchema) -> SharedPart:
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        table = parse_buffer(fh.read(stop - start), schema)
+    rc = table.receptions
+    return SharedPart(
+        columns={k: SharedColumn.publish(v) for k, v in table.columns().items()},
+        receptions={k: SharedColumn.publish(v) for k, v in rc.columns().items()},
+        events=table.events,
+        dictionary=table.dictionary,
+    )
+
+
+def merge_by_time(tables: list[UplinkTable]) -> UplinkTable:
+    """Concatenate ``tables`` and order the rows by ``received_at``.
+
+    The sort is stable, so rows with equal times keep their input order.
+    """
+    table = UplinkTable.concat(tables) if tables else UplinkTable.empty()
+    return table.take(np.argsort(table.received_at, kind="stable"))
+
+
+def ingest_parallel(
+    paths,
+    max_workers: int | None = None,
+    split_bytes: int = DEFAULT_SPLIT_BYTES,
+    dedupe: bool = True,
+) -> UplinkTable:
+    """Parse ``paths`` on a process pool and merge them in time order.
+
+    Exports larger than ``split_bytes`` are parsed in byte ranges of about
+    that size.  With ``dedupe`` the uplinks repeated by overlapping exports
+    are merged (see :func:`~jamaica_bay.dedup.deduplicate`).
+    """
+    tasks = []
+    for path in map(os.fspath, paths):
+        with open(path, "rb") as fh:
+            schema, _ = sniff(fh.read(SNIFF_BYTES))
+        n_parts = max(1, -(-os.path.getsize(path) // split_bytes))
+        tasks += [(path, start, stop, schema) for start, stop in split_ranges(path, schema, n_parts)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = [f.result().load() for f in [pool.submit(_parse_part, *task) for task in tasks]]
+    table = merge_by_time(parts)
+    return deduplicate(table) if dedupe else table
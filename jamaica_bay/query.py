@@ -0,0 +1,168 @@
+"""Lazy scans with time-range and column pushdown.
+
+A :class:`Scan` records a ``received_at`` range and a column projection and
+applies them only when collected, in the reader rather than afterwards:
+
+* over CSV exports the range becomes a byte range, found by bisecting the
+  file on ``received_at`` (see :func:`~jamaica_bay.ingest.tail_offset`), and
+  only the selected columns of the rows in it are decoded;
+* over an :class:`~jamaica_bay.cache.ExportCache` only the day partitions
+  overlapping the range are opened, and only the selected column files of
+  those are memory-mapped.
+
+::
+
+    storm = scan("jamaica_bay_20250924.csv").filter("2025-09-01", "2025-09-03").select("speed", "dir")
+    columns = storm.collect()
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .cache import ExportCache, load_columns
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .dedup import deduplicate, first_copies, uplink_ids
+from .ingest import DEFAULT_SLACK, head_offset, tail_offset
+from .loader import parse_buffer, parse_columns
+from .schema import SNIFF_BYTES, ExportSchema, sniff
+from .table import EventTable, UplinkTable
+
+# Columns read in any case: the range filter and deduplication need them.
+_KEY_COLUMNS = ("device_id", "received_at", "f_cnt")
+
+
+@dataclass(frozen=True)
+class Scan:
+    """A lazy query over exports or an export cache.
+
+    ``filter`` and ``select`` return new scans; nothing is read until
+    :meth:`collect` or :meth:`to_table`.  Identifier codes in the result
+    refer to :attr:`dictionary`.
+    """
+
+    source: tuple[str, ...] | ExportCache
+    schema: ExportSchema | None = None
+    start: np.datetime64 | None = None
+    end: np.datetime64 | None = None
+    names: tuple[str, ...] | None = None
+    dedupe: bool = True
+    dictionary: Dictionary = DEFAULT_DICTIONARY
+
+    def filter(self, start=None, end=None) -> Scan:
+        """Keep rows received in ``[start, end)``, within any earlier filter."""
+        start = None if start is None else np.datetime64(start, "ns")
+        end = None if end is None else np.datetime64(end, "ns")
+        if self.start is not None:
+            start = self.start if start is None else max(start, self.start)
+        if self.end is not None:
+            end = self.end if end is None else min(end, self.end)
+        return replace(self, start=start, end=end)
+
+    def select(self, *names: str) -> Scan:
+        """Keep only the uplink columns ``names``, in that order."""
+        available = UplinkTable.column_names() if self.names is None else self.names
+        unknown = [n for n in names if n not in available]
+        if unknown:
+            raise KeyError(f"columns not available in this scan: {unknown}")
+        return replace(self, names=tuple(names))
+
+    def plan(self) -> list:
+        """What :meth:`collect` will read.
+
+        ``(path, first byte, stop byte)`` ranges for exports, partition
+        directories for a cache.
+        """
+        if isinstance(self.source, ExportCache):
+            return self.source.partitions(self.start, self.end)
+        ranges = []
+        for path in self.source:
+            with open(path, "rb") as fh:
+                schema = self.schema or sniff(fh.read(SNIFF_BYTES))[0]
+                column = schema.fields["received_at"]
+                size = fh.seek(0, os.SEEK_END)
+                first = 0 if self.start is None else tail_offset(fh, self.start - DEFAULT_SLACK, column)
+                stop = size if self.end is None else head_offset(fh, self.end + DEFAULT_SLACK, column)
+            if stop > first:
+                ranges.append((path, first, stop))
+        return ranges
+
+    def collect(self) -> dict[str, np.ndarray]:
+        """Read the selected columns of the rows in range."""
+        names = list(UplinkTable.column_names() if self.names is None else self.names)
+        needed = list(dict.fromkeys([*names, *_KEY_COLUMNS]))
+        cached = isinstance(self.source, ExportCache)
+        # A cache keeps the events per export rather than per partition.
+        parts, events = [], [self.source.events()] if cached else []
+        for unit in self.plan():
+            if cached:
+                columns = load_columns(unit, needed)
+            else:
+                columns, part_events = self._parse(unit, needed)
+                events.append(part_events)
+            keep = self._in_range(columns["received_at"])
+            parts.append({n: c[keep] for n, c in columns.items()})
+        if not parts:
+            empty = UplinkTable.empty(self.dictionary).columns()
+            return {n: empty[n] for n in names}
+        columns = {n: np.concatenate([p[n] for p in parts]) for n in needed}
+        if self.dedupe and len(columns["received_at"]):
+            device, t = columns["device_id"], columns["received_at"]
+            deployment = EventTable.concat(events).epochs(device, t)
+            keep = first_copies(uplink_ids(device, t, columns["f_cnt"], deployment))
+            columns = {n: c[keep] for n, c in columns.items()}
+        return {n: columns[n] for n in names}
+
+    def to_table(self) -> UplinkTable:
+        """Read whole rows in range, with receptions and events; ignores :meth:`select`."""
+        if isinstance(self.source, ExportCache):
+            return self.source.read(self.start, self.end, dedupe=self.dedupe)
+        tables = []
+        for path, first, stop in self.plan():
+            with open(path, "rb") as fh:
+                fh.seek(first)
+                table = parse_buffer(fh.read(stop - first), self._schema(path), self.dictionary)
+            tables.append(table.take(self._in_range(table.received_at)))
+        table = UplinkTable.concat(tables) if tables else UplinkTable.empty(self.dictionary)
+        return deduplicate(table) if self.dedupe else table
+
+    def _schema(self, path: str) -> ExportSchema:
+        if self.schema is not None:
+            return self.schema
+        with open(path, "rb") as fh:
+            return sniff(fh.read(SNIFF_BYTES))[0]
+
+    def _parse(self, unit: tuple[str, int, int], names: list[str]) -> tuple[dict[str, np.ndarray], EventTable]:
+        path, first, stop = unit
+        with open(path, "rb") as fh:
+            fh.seek(first)
+            return parse_columns(fh.read(stop - first), names, self._schema(path), self.dictionary)
+
+    def _in_range(self, received_at: np.ndarray) -> np.ndarray:
+        keep = np.ones(len(received_at), dtype=bool)
+        if self.start is not None:
+            keep &= received_at >= self.start
+        if self.end is not None:
+            keep &= received_at < self.end
+        return keep
+
+
+def scan(
+    source,
+    schema: ExportSchema | None = None,
+    dictionary: Dictionary = DEFAULT_DICTIONARY,
+    dedupe: bool = True,
+) -> Scan:
+    """Start a lazy scan of an :class:`~jamaica_bay.cache.ExportCache`, an export or a list of exports.
+
+    ``schema`` and ``dictionary`` apply to exports; a cache has its own.
+    With ``dedupe`` uplinks repeated by overlapping exports are merged.
+    """
+    if isinstance(source, ExportCache):
+        return Scan(source, dedupe=dedupe, dictionary=source.dictionary)
+    if isinstance(source, (str, os.PathLike)):
+        source = [source]
+    return Scan(tuple(map(os.fspath, source)), schema=schema, dedupe=dedupe, dictionary=dictionary)
@@ -0,0 +1,166 @@
+"""Compact per-message uplink records.
+
+The columnar tables suit batch work; a live path that handles one uplink at a
+time, such as replaying an export or receiving webhooks, needs a small
+per-row object instead.  A ``dict`` of the 39 export fields costs about two
+kilobytes per row, almost all of it in string objects.  :class:`Uplink` keeps
+identifiers as dictionary codes, times as int ns, and packs the float32
+channels and the gateway receptions into one ``bytes`` payload.
+``benchmarks/record.py`` compares the two.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+from .schema import UPLINK_V1, ExportSchema
+from .table import CHANNELS, MISSING_RSSI, EventTable, ReceptionTable, UplinkTable
+from .timestamps import rfc3339_ns
+
+_CHANNELS = struct.Struct(f"<{len(CHANNELS)}f")
+# One reception: gateway code, time ns, rssi, snr.
+_RECEPTION = struct.Struct("<iqhf")
+
+
+class Uplink:
+    """One uplink: device code, frame counter, time and packed measurements.
+
+    ``receptions`` unpacks to ``(gateway code, time ns, rssi, snr)`` tuples
+    and each channel in :data:`~jamaica_bay.table.CHANNELS` is readable as
+    an attribute.  Codes refer to the dictionary the record was built with.
+    """
+
+    __slots__ = ("device", "f_cnt", "received_at", "_payload")
+
+    def __init__(self, device: int, f_cnt: int, received_at: int, channels: Sequence[float], receptions=()):
+        self.device = device
+        self.f_cnt = f_cnt
+        self.received_at = received_at
+        self._payload = _CHANNELS.pack(*channels) + b"".join(_RECEPTION.pack(*r) for r in receptions)
+
+    def __repr__(self) -> str:
+        return f"Uplink(device={self.device}, f_cnt={self.f_cnt}, received_at={np.datetime64(self.received_at, 'ns')})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Uplink):
+            return NotImplemented
+        return (self.device, self.f_cnt, self.received_at, self._payload) == (
+            other.device,
+            other.f_cnt,
+            other.received_at,
+            other._payload,
+        )
+
+    @property
+    def channels(self) -> tuple[float, ...]:
+        """Channel values in :data:`~jamaica_bay.table.CHANNELS` order."""
+        return _CHANNELS.unpack_from(self._payload)
+
+    @property
+    def receptions(self) -> list[tuple[int, int, int, float]]:
+        return list(_RECEPTION.iter_unpack(memoryview(self._payload)[_CHANNELS.size :]))
+
+    @property
+    def n_receptions(self) -> int:
+        return (len(self._payload) - _CHANNELS.size) // _RECEPTION.size
+
+    @classmethod
+    def from_row(
+        cls, row: Sequence[str], schema: ExportSchema = UPLINK_V1, dictionary: Dictionary = DEFAULT_DICTIONARY
+    ) -> Uplink:
+        """Build a record from the string fields of one export row.
+
+        Missing trailing fields are taken as empty, as the vectorized parser
+        does.  Raises ``ValueError`` for annotation rows, whose ``f_cnt`` is
+        text.
+        """
+        if len(row) < schema.n_fields:
+            row = [*row, *[""] * (schema.n_fields - len(row))]
+        fields = schema.fields
+        receptions = []
+        for gtw, time, rssi, snr in schema.reception_groups:
+            if row[gtw]:
+                receptions.append(
+                    (
+                        dictionary.add(row[gtw]),
+                        rfc3339_ns(row[time]),
+                        int(row[rssi]) if row[rssi] else MISSING_RSSI,
+                        float(row[snr]) if row[snr] else math.nan,
+                    )
+                )
+        return cls(
+            dictionary.add(row[fields["device_id"]]),
+            int(row[fields["f_cnt"]]),
+            rfc3339_ns(row[fields["received_at"]]),
+            [float(row[fields[c]]) if row[fields[c]] else math.nan for c in CHANNELS],
+            receptions,
+        )
+
+
+def iter_uplinks(table: UplinkTable) -> Iterator[Uplink]:
+    """Yield the rows of ``table`` as records, in order.
+
+    Codes are those of ``table.dictionary``.
+    """
+    rc = table.receptions
+    order = np.argsort(rc.uplink, kind="stable")
+    bounds = np.searchsorted(rc.uplink[order], np.arange(len(table) + 1))
+    groups = list(
+        zip(
+            rc.gateway[order].tolist(),
+            rc.time[order].view(np.int64).tolist(),
+            rc.rssi[order].tolist(),
+            rc.snr[order].tolist(),
+        )
+    )
+    channels = np.column_stack([getattr(table, c) for c in CHANNELS]).tolist()
+    rows = zip(table.device_id.tolist(), table.f_cnt.tolist(), table.received_at.view(np.int64).tolist(), channels)
+    for i, (device, f_cnt, t, values) in enumerate(rows):
+        yield Uplink(device, f_cnt, t, values, groups[bounds[i] : bounds[i + 1]])
+
+
+def to_table(records: Iterable[Uplink], dictionary: Dictionary = DEFAULT_DICTIONARY) -> UplinkTable:
+    """Collect records built with ``dictionary`` back into a table.
+
+    Records carry no ``application_id`` or ``local_time``; they come out as
+    code -1 and ``NaT``, with ``utc_offset`` 0.
+    """
+    records = list(records)
+    n = len(records)
+    channels = np.array([r.channels for r in records], dtype=np.float32).reshape(n, len(CHANNELS))
+    counts = np.array([r.n_receptions for r in records], dtype=np.int64)
+    packed = b"".join(r._payload[_CHANNELS.size :] for r in records)
+    raw = np.frombuffer(packed, dtype=np.dtype([("gateway", "<i4"), ("time", "<i8"), ("rssi", "<i2"), ("snr", "<f4")]))
+    receptions = ReceptionTable(
+        uplink=np.repeat(np.arange(n), counts),
+        gateway=raw["gateway"].astype(np.int32),
+        time=raw["time"].astype(np.int64).view("datetime64[ns]"),
+        rssi=raw["rssi"].astype(np.int16),
+        snr=raw["snr"].astype(np.float32),
+        dictionary=dictionary,
+    )
+    return UplinkTable(
+        device_id=np.array([r.device for r in records], dtype=np.int32),
+        application_id=np.full(n, -1, dtype=np.int32),
+        received_at=np.array([r.received_at for r in records], dtype=np.int64).view("datetime64[ns]"),
+        local_time=np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]"),
+        utc_offset=np.zeros(n, dtype=np.int16),
+        f_cnt=np.array([r.f_cnt for r in records], dtype=np.int64),
+        **{c: channels[:, i] for i, c in enumerate(CHANNELS)},
+        receptions=receptions,
+        events=EventTable.empty(dictionary),
+        dictionary=dictionary,
+    )
+
+
+def _channel_property(index: int, name: str) -> property:
+    return property(lambda self: _CHANNELS.unpack_from(self._payload)[index], doc=f"float32 ``{name}`` value.")
+
+
+for _i, _name in enumerate(CHANNELS):
+    setattr(Uplink, _name, _channel_property(_i, _name))
@@ -0,0 +1,194 @@
+"""Vector-averaged wind resampling onto regular intervals.
+
+``dir`` is the meteorological direction the wind blows from, in degrees, and
+wraps at 0/360: the arithmetic mean of 350 and 10 is 180, not 0.  Samples are
+therefore decomposed into eastward and northward components
+
+    u = -speed * sin(dir),  v = -speed * cos(dir)
+
+and the components, not the angles, are averaged.  Binning is one
+``np.add.reduceat`` over a ``(count, speed, u, v, sin, cos)`` matrix of the
+time-sorted samples; the unit-vector sums feed the circular statistics of
+:mod:`jamaica_bay.circular`.  The bins keep sums rather than means, so finer bins coarsen into
+coarser ones (1 min into 10 min into 1 h) without going back to the samples.
+
+Given a :class:`~jamaica_bay.gaps.GapIndex`, bins that an outage runs through
+are flagged in :attr:`WindBins.outage`, so their partial averages can be told
+apart from those of bins that saw every frame.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import circular
+from .table import UplinkTable
+
+_INTERVAL = re.compile(r"(\d+)\s*(s|min|h|d)")
+_UNITS = {"s": "s", "min": "m", "h": "h", "d": "D"}
+
+
+def parse_interval(interval) -> np.timedelta64:
+    """``"90s"``, ``"10min"``, ``"1h"`` or ``"1d"`` (or a timedelta64) as timedelta64[ns]."""
+    if isinstance(interval, str):
+        m = _INTERVAL.fullmatch(interval.strip())
+        if m is None:
+            raise ValueError(f"unsupported interval: {interval!r}")
+        interval = np.timedelta64(int(m.group(1)), _UNITS[m.group(2)])
+    interval = np.timedelta64(interval, "ns")
+    if interval <= np.timedelta64(0, "ns"):
+        raise ValueError(f"interval must be positive: {interval}")
+    return interval
+
+
+@dataclass
+class WindBins:
+    """Wind sums per regular interval; bins start at multiples of ``interval``.
+
+    ``u_sum``/``v_sum`` are sums of the eastward/northward components,
+    ``speed_sum`` of the scalar speed and ``sin_sum``/``cos_sum`` of the unit
+    vectors of ``dir``, over the ``count`` samples of each bin.  ``outage``,
+    when gaps were given, is True for bins that overlap a frame-counter gap.
+    """
+
+    start: np.ndarray
+    interval: np.timedelta64
+    count: np.ndarray
+    speed_sum: np.ndarray
+    u_sum: np.ndarray
+    v_sum: np.ndarray
+    sin_sum: np.ndarray
+    cos_sum: np.ndarray
+    outage: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def speed(self) -> np.ndarray:
+        """Scalar mean speed; NaN for empty bins."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.speed_sum / self.count
+
+    @property
+    def vector_speed(self) -> np.ndarray:
+        """Magnitude of the mean wind vector; at most :attr:`speed`."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.hypot(self.u_sum, self.v_sum) / self.count
+
+    @property
+    def dir(self) -> np.ndarray:
+        """Direction of the mean wind vector in ``[0, 360)``; NaN for empty or calm bins."""
+        return circular.mean_direction(-self.u_sum, -self.v_sum)
+
+    @property
+    def unit_dir(self) -> np.ndarray:
+        """Mean direction of the unit vectors, ignoring speed."""
+        return circular.mean_direction(self.sin_sum, self.cos_sum)
+
+    @property
+    def circular_variance(self) -> np.ndarray:
+        return circular.circular_variance(self.sin_sum, self.cos_sum, self.count)
+
+    @property
+    def sigma_theta(self) -> np.ndarray:
+        """Yamartino standard deviation of direction, in degrees."""
+        return circular.yamartino_sigma(self.sin_sum, self.cos_sum, self.count)
+
+    @property
+    def steadiness(self) -> np.ndarray:
+        """:attr:`vector_speed` over :attr:`speed`: 1 for a constant direction."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.hypot(self.u_sum, self.v_sum) / self.speed_sum
+
+    def coarsen(self, interval, fill: bool = True) -> WindBins:
+        """Merge bins into ``interval`` bins, which must be a multiple of the current one."""
+        step = parse_interval(interval).view(np.int64)
+        if step % self.interval.view(np.int64):
+            raise ValueError(f"{interval} is not a multiple of {self.interval}")
+        keys = self.start.view(np.int64) // step
+        sums = np.column_stack([self.count, self.speed_sum, self.u_sum, self.v_sum, self.sin_sum, self.cos_sum])
+        return _bins(keys, sums, step, fill, self.outage)
+
+
+def wind_bins(
+    received_at: np.ndarray, speed: np.ndarray, dir: np.ndarray, interval="10min", fill: bool = True
+) -> WindBins:
+    """Bin samples into ``interval`` bins.
+
+    Samples with a missing time, speed or direction are skipped.  With
+    ``fill`` the bins form a gapless grid from the first to the last sample,
+    empty bins having count 0; otherwise only bins with samples are returned.
+    """
+    step = parse_interval(interval).view(np.int64)
+    t = np.asarray(received_at, dtype="datetime64[ns]").view(np.int64)
+    speed = np.asarray(speed, dtype=np.float64)
+    rad = np.radians(np.asarray(dir, dtype=np.float64))
+    ok = ~np.isnat(t.view("datetime64[ns]")) & np.isfinite(speed) & np.isfinite(rad)
+    t, speed, rad = t[ok], speed[ok], rad[ok]
+    if np.any(t[1:] < t[:-1]):
+        order = np.argsort(t, kind="stable")
+        t, speed, rad = t[order], speed[order], rad[order]
+    sin, cos = np.sin(rad), np.cos(rad)
+    sums = np.column_stack([np.ones_like(speed), speed, -speed * sin, -speed * cos, sin, cos])
+    return _bins(t // step, sums, step, fill)
+
+
+def resample_wind(table: UplinkTable, interval="10min", fill: bool = True, gaps=None) -> WindBins:
+    """Vector-average the ``speed``/``dir`` of ``table`` over ``interval`` bins.
+
+    With a :class:`~jamaica_bay.gaps.GapIndex` of ``table`` as ``gaps``, the
+    bins get their :attr:`~WindBins.outage` flags.
+    """
+    bins = wind_bins(table.received_at, table.speed, table.dir, interval, fill)
+    if gaps is not None:
+        bins.outage = gaps.overlaps(bins.start, bins.start + bins.interval)
+    return bins
+
+
+def wind_levels(
+    table: UplinkTable, intervals=("1min", "10min", "1h"), fill: bool = True, gaps=None
+) -> dict[str, WindBins]:
+    """Bins at several intervals from one pass over the samples.
+
+    The samples are binned at the finest interval only; each coarser level
+    is merged from it.
+    """
+    steps = sorted(intervals, key=parse_interval)
+    finest = resample_wind(table, steps[0], fill, gaps)
+    return {interval: finest if interval == steps[0] else finest.coarsen(interval, fill) for interval in intervals}
+
+
+def _bins(keys: np.ndarray, sums: np.ndarray, step: int, fill: bool, outage: np.ndarray | None = None) -> WindBins:
+    """Reduce ``sums`` rows (and ``outage`` flags) over runs of equal, ascending ``keys``."""
+    if len(keys):
+        first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sums = np.add.reduceat(sums, first, axis=0)
+        if outage is not None:
+            outage = np.logical_or.reduceat(outage, first)
+        keys = keys[first]
+    else:
+        sums = np.zeros((0, sums.shape[1]))
+    if fill and len(keys):
+        rows = keys - keys[0]
+        grid = np.zeros((int(rows[-1]) + 1, sums.shape[1]))
+        grid[rows] = sums
+        if outage is not None:
+            flags = np.zeros(len(grid), dtype=bool)
+            flags[rows] = outage
+            outage = flags
+        keys, sums = np.arange(keys[0], keys[-1] + 1), grid
+    return WindBins(
+        start=(keys * step).view("datetime64[ns]"),
+        interval=np.timedelta64(step, "ns"),
+        count=sums[:, 0].astype(np.int64),
+        speed_sum=sums[:, 1],
+        u_sum=sums[:, 2],
+        v_sum=sums[:, 3],
+        sin_sum=sums[:, 4],
+        cos_sum=sums[:, 5],
+        outage=outage,
+    )
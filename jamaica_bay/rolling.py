@@ -0,0 +1,360 @@
+"""Trailing-window statistics over irregular ``received_at`` spacing.
+
+Uplinks arrive every ~93 s with jitter and gaps, so windows are defined in
+time, ``(t - window, t]``, not in samples.  Rolling extrema use a monotonic
+deque: each sample enters and leaves it once, so a whole series costs
+``O(n)`` however long the window.  Rolling means and variances of whole
+tables come from cumulative sums of all channels at once; live streams fed
+one uplink at a time keep Welford sums instead (:class:`StreamingStats`).
+
+Every device of a table has its own windows.  Given a
+:class:`~jamaica_bay.gaps.GapIndex`, or any ``segment`` label per sample,
+windows also stop at the start of their sample's segment, so no window
+reaches back across an outage.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from .gaps import GapIndex
+from .resample import parse_interval
+from .table import UplinkTable
+
+
+class RollingExtremum:
+    """Streaming maximum (or minimum) of the samples in a trailing time window.
+
+    Samples must be pushed in time order.  On ties the earliest sample is
+    reported as the extremum.
+    """
+
+    def __init__(self, window="10min", mode: str = "max"):
+        if mode not in ("max", "min"):
+            raise ValueError(f"mode must be 'max' or 'min', not {mode!r}")
+        self.window = int(parse_interval(window).view(np.int64))
+        self._sign = 1.0 if mode == "max" else -1.0
+        # (time ns, signed value), values strictly decreasing from the left.
+        self._deque: deque[tuple[int, float]] = deque()
+
+    def push(self, t: int, value: float) -> tuple[float, int | None]:
+        """Add a sample at ``t`` ns and return the window's ``(extremum, time)``.
+
+        A NaN ``value`` is not added, but the window still moves to ``t``.
+        The extremum is NaN, with time ``None``, for an empty window.
+        """
+        dq = self._deque
+        if value == value:
+            v = self._sign * value
+            while dq and dq[-1][1] < v:
+                dq.pop()
+            dq.append((t, v))
+        horizon = t - self.window
+        while dq and dq[0][0] <= horizon:
+            dq.popleft()
+        if not dq:
+            return math.nan, None
+        return self._sign * dq[0][1], dq[0][0]
+
+    def reset(self) -> None:
+        """Forget every sample, as after an outage."""
+        self._deque.clear()
+
+
+class GustDetector:
+    """Streaming peak wind, time of peak and gust factor per uplink.
+
+    The gust factor is the peak speed over the mean speed of the same
+    trailing window; it is NaN for a calm window, whose mean may come out
+    a rounding error away from zero.
+    """
+
+    def __init__(self, window="10min"):
+        self._peak = RollingExtremum(window, "max")
+        self.window = self._peak.window
+        self._samples: deque[tuple[int, float]] = deque()
+        self._sum = 0.0
+
+    def push(self, t: int, speed: float) -> tuple[float, int | None, float]:
+        """Add the speed measured at ``t`` ns; returns ``(peak, peak time, gust factor)``."""
+        peak, peak_t = self._peak.push(t, speed)
+        if speed == speed:
+            self._samples.append((t, speed))
+            self._sum += speed
+        horizon = t - self.window
+        while self._samples and self._samples[0][0] <= horizon:
+            self._sum -= self._samples.popleft()[1]
+        if not self._samples:
+            self._sum = 0.0
+            return peak, peak_t, math.nan
+        mean = self._sum / len(self._samples)
+        return peak, peak_t, peak / mean if peak > 0 else math.nan
+
+
+@dataclass
+class Gusts:
+    """Per-uplink gust metrics over the trailing window ending at that uplink."""
+
+    peak: np.ndarray
+    peak_time: np.ndarray
+    mean: np.ndarray
+    gust_factor: np.ndarray
+
+
+def rolling_extremum(
+    received_at: np.ndarray,
+    values: np.ndarray,
+    window="10min",
+    mode: str = "max",
+    segment: np.ndarray | None = None,
+    device_id: np.ndarray | None = None,
+):
+    """Trailing-window extremum at every sample and the time it occurred.
+
+    Rows come back in input order; they are processed in time order, per
+    device when ``device_id`` is given.  With ``segment``, the window
+    restarts wherever the label changes between consecutive samples of a
+    device.  Returns ``(extremum, time of extremum)``.
+    """
+    order, ts, _, restart = _device_order(received_at, device_id, segment)
+    out = np.full(len(ts), np.nan)
+    at = np.full(len(ts), np.datetime64("NaT", "ns").view(np.int64))
+    extremum = RollingExtremum(window, mode)
+    values = np.asarray(values, dtype=np.float64)[order]
+    for i, ti, v, new in zip(order.tolist(), ts.tolist(), values.tolist(), restart.tolist()):
+        if new:
+            extremum.reset()
+        value, when = extremum.push(ti, v)
+        out[i] = value
+        if when is not None:
+            at[i] = when
+    return out, at.view("datetime64[ns]")
+
+
+def rolling_max(
+    received_at: np.ndarray,
+    values: np.ndarray,
+    window="10min",
+    segment: np.ndarray | None = None,
+    device_id: np.ndarray | None = None,
+):
+    """:func:`rolling_extremum` with ``mode="max"``."""
+    return rolling_extremum(received_at, values, window, "max", segment, device_id)
+
+
+def rolling_min(
+    received_at: np.ndarray,
+    values: np.ndarray,
+    window="10min",
+    segment: np.ndarray | None = None,
+    device_id: np.ndarray | None = None,
+):
+    """:func:`rolling_extremum` with ``mode="min"``."""
+    return rolling_extremum(received_at, values, window, "min", segment, device_id)
+
+
+def _restarts(segment: np.ndarray) -> np.ndarray:
+    """Where the label of time-ordered samples differs from the previous one."""
+    restart = np.zeros(len(segment), dtype=bool)
+    restart[1:] = segment[1:] != segment[:-1]
+    return restart
+
+
+def _device_order(received_at: np.ndarray, device_id: np.ndarray | None, segment: np.ndarray | None):
+    """Order of the samples by device, then time, and where windows restart in it.
+
+    Returns the order, the sorted times in ns, dense device numbers and the
+    restart mask: the first sample of every device and every segment change.
+    """
+    t = np.asarray(received_at, dtype="datetime64[ns]").view(np.int64)
+    if device_id is None:
+        device = np.zeros(len(t), dtype=np.int64)
+    else:
+        _, device = np.unique(np.asarray(device_id), return_inverse=True)
+    order = np.lexsort((t, device))
+    device = device[order]
+    restart = _restarts(device)
+    if segment is not None:
+        restart |= _restarts(np.asarray(segment)[order])
+    return order, t[order], device, restart
+
+
+def rolling_moments(
+    received_at: np.ndarray,
+    values: np.ndarray,
+    window="1h",
+    segment: np.ndarray | None = None,
+    device_id: np.ndarray | None = None,
+):
+    """Trailing-window count, mean and sample variance of every column of ``values``.
+
+    ``values`` is ``(n,)`` or ``(n, channels)``; NaNs are left out of their
+    column's windows.  All columns are done at once from cumulative sums of
+    the values and their squares, taken around each column's mean so that
+    the differences of large sums keep their precision.  With ``device_id``,
+    every device has its own windows; with ``segment``, windows start no
+    earlier than the first sample of their segment.  Returns arrays shaped
+    like ``values``, in input order; the variance is NaN below two samples.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    flat = x.ndim == 1
+    x = x[:, None] if flat else x
+    order, ts, device, restart = _device_order(received_at, device_id, segment)
+    x = x[order]
+    valid = ~np.isnan(x)
+    shift = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    d = np.where(valid, x - shift, 0.0)
+    zero = np.zeros((1, x.shape[1]))
+    s0 = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    s1 = np.concatenate([zero, np.cumsum(d, axis=0)])
+    s2 = np.concatenate([zero, np.cumsum(d * d, axis=0)])
+    # Samples are sorted by device, then time: pack (device, rank of time)
+    # into one key, so one search finds every window start within its device.
+    times = np.unique(ts)
+    stride = len(times) + 1
+    keys = device * stride + np.searchsorted(times, ts)
+    horizon = device * stride + np.searchsorted(times, ts - parse_interval(window).view(np.int64), side="right")
+    lo = np.searchsorted(keys, horizon, side="left")
+    lo = np.maximum(lo, np.maximum.accumulate(np.where(restart, np.arange(len(ts)), 0)))
+    hi = np.arange(1, len(ts) + 1)
+    n = s0[hi] - s0[lo]
+    w1 = s1[hi] - s1[lo]
+    w2 = s2[hi] - s2[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = w1 / n
+        var = np.where(n > 1, np.maximum(w2 - w1 * mean, 0.0) / (n - 1), np.nan)
+    results = []
+    for a in (n.astype(np.int64), mean + shift, var):
+        out = np.empty_like(a)
+        out[order] = a
+        results.append(out[:, 0] if flat else out)
+    return tuple(results)
+
+
+@dataclass
+class RollingStats:
+    """Trailing-window statistics of one channel, one value per uplink."""
+
+    count: np.ndarray
+    mean: np.ndarray
+    var: np.ndarray
+    min: np.ndarray | None = None
+    max: np.ndarray | None = None
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+
+def rolling_stats(
+    table: UplinkTable,
+    names=("speed", "temperature", "pressure"),
+    window="1h",
+    extrema: bool = True,
+    gaps: GapIndex | None = None,
+) -> dict[str, RollingStats]:
+    """Rolling count, mean, variance and (with ``extrema``) min/max per channel.
+
+    Each device has its own windows.  With ``gaps``, windows do not reach
+    back across them.
+    """
+    values = np.column_stack([getattr(table, name) for name in names])
+    segment = None if gaps is None else gaps.segments(table.device_id, table.received_at)
+    count, mean, var = rolling_moments(table.received_at, values, window, segment, table.device_id)
+    stats = {}
+    for k, name in enumerate(names):
+        lo = hi = None
+        if extrema:
+            lo, _ = rolling_min(table.received_at, values[:, k], window, segment, table.device_id)
+            hi, _ = rolling_max(table.received_at, values[:, k], window, segment, table.device_id)
+        stats[name] = RollingStats(count[:, k], mean[:, k], var[:, k], lo, hi)
+    return stats
+
+
+class StreamingStats:
+    """Trailing-window count, mean, variance, min and max of several channels.
+
+    Each push adds a sample with Welford's update and removes the samples
+    that left the window with its inverse, so no window is ever summed from
+    scratch.  Samples must be pushed in time order.
+    """
+
+    def __init__(self, n_channels: int, window="1h"):
+        self.window = int(parse_interval(window).view(np.int64))
+        self._samples: deque[tuple[int, list[float]]] = deque()
+        self._count = [0] * n_channels
+        self._mean = [0.0] * n_channels
+        self._m2 = [0.0] * n_channels
+        self._min = [RollingExtremum(self.window, "min") for _ in range(n_channels)]
+        self._max = [RollingExtremum(self.window, "max") for _ in range(n_channels)]
+        self._extrema = [(math.nan, math.nan)] * n_channels
+
+    def push(self, t: int, values) -> None:
+        """Add the channel values measured at ``t`` ns; NaNs are skipped."""
+        values = [float(v) for v in values]
+        count, mean, m2 = self._count, self._mean, self._m2
+        for k, x in enumerate(values):
+            if x == x:
+                count[k] += 1
+                delta = x - mean[k]
+                mean[k] += delta / count[k]
+                m2[k] += delta * (x - mean[k])
+        self._samples.append((t, values))
+
+        horizon = t - self.window
+        while self._samples and self._samples[0][0] <= horizon:
+            for k, x in enumerate(self._samples.popleft()[1]):
+                if x == x:
+                    count[k] -= 1
+                    if count[k]:
+                        delta = x - mean[k]
+                        mean[k] -= delta / count[k]
+                        m2[k] -= delta * (x - mean[k])
+                    else:
+                        mean[k] = m2[k] = 0.0
+
+        self._extrema = [(self._min[k].push(t, x)[0], self._max[k].push(t, x)[0]) for k, x in enumerate(values)]
+
+    @property
+    def count(self) -> np.ndarray:
+        return np.array(self._count, dtype=np.int64)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.where(self.count > 0, self._mean, np.nan)
+
+    @property
+    def var(self) -> np.ndarray:
+        count = self.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 1, np.maximum(self._m2, 0.0) / (count - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+    @property
+    def min(self) -> np.ndarray:
+        return np.array([lo for lo, _ in self._extrema])
+
+    @property
+    def max(self) -> np.ndarray:
+        return np.array([hi for _, hi in self._extrema])
+
+
+def gusts(table: UplinkTable, window="10min", gaps: GapIndex | None = None) -> Gusts:
+    """Peak wind, its time and the gust factor at every uplink of ``table``.
+
+    Each device has its own windows.  With ``gaps``, windows do not reach
+    back across them.
+    """
+    segment = None if gaps is None else gaps.segments(table.device_id, table.received_at)
+    peak, peak_time = rolling_max(table.received_at, table.speed, window, segment, table.device_id)
+    _, mean, _ = rolling_moments(table.received_at, table.speed, window, segment, table.device_id)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        factor = np.where(peak > 0, peak / mean, np.nan)
+    return Gusts(peak=peak, peak_time=peak_time, mean=mean, gust_factor=factor)
@@ -0,0 +1,173 @@
+"""Incrementally updated wind roses.
+
+A wind rose is a 2-D histogram of samples over speed classes and direction
+sectors.  :class:`DailyRoses` keeps one histogram per local calendar day, so
+the rose of any date range is the sum of that range's days and a new export
+only adds counts to the days it touches.  Histograms of the same binning add
+up, which is all that merging stations, exports or days takes.
+
+Roses are saved as one ``.npz`` file, replaced atomically, holding the int64
+``counts`` of shape ``(days, speed classes, sectors)``, the ``speed_edges``
+and the ``first_day``.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from .table import UplinkTable
+
+#: Sixteen 22.5 degree sectors, the first centred on north.
+DEFAULT_SECTORS = 16
+#: Upper edges of the speed classes below the last, open-ended one.
+DEFAULT_SPEED_EDGES = (0.5, 2.0, 4.0, 6.0, 8.0, 11.0)
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class WindRose:
+    """Sample counts per ``(speed class, direction sector)``.
+
+    Class ``k`` holds speeds in ``[speed_edges[k-1], speed_edges[k])``; the
+    first class starts at 0 and the last is open-ended.  Sector ``j`` is
+    centred on ``j * 360 / sectors`` degrees.
+    """
+
+    counts: np.ndarray
+    speed_edges: tuple[float, ...] = DEFAULT_SPEED_EDGES
+
+    @property
+    def sectors(self) -> int:
+        return self.counts.shape[1]
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def sector_centers(self) -> np.ndarray:
+        return np.arange(self.sectors) * (360.0 / self.sectors)
+
+    def frequencies(self) -> np.ndarray:
+        """Counts as fractions of all samples; zeros for an empty rose."""
+        return self.counts / max(self.total, 1)
+
+    def __add__(self, other: WindRose) -> WindRose:
+        _check_binning(self.speed_edges, self.sectors, other.speed_edges, other.sectors)
+        return WindRose(self.counts + other.counts, self.speed_edges)
+
+
+class DailyRoses:
+    """One wind rose per local calendar day, growing as uplinks arrive."""
+
+    def __init__(
+        self,
+        sectors: int = DEFAULT_SECTORS,
+        speed_edges=DEFAULT_SPEED_EDGES,
+        first_day: np.datetime64 | None = None,
+        counts: np.ndarray | None = None,
+    ):
+        self.speed_edges = tuple(float(e) for e in speed_edges)
+        self.sectors = sectors
+        self.first_day = None if first_day is None else np.datetime64(first_day, "D")
+        n_classes = len(self.speed_edges) + 1
+        self.counts = np.zeros((0, n_classes, sectors), dtype=np.int64) if counts is None else counts
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def days(self) -> np.ndarray:
+        if self.first_day is None:
+            return np.empty(0, dtype="datetime64[D]")
+        return self.first_day + np.arange(len(self.counts))
+
+    def update(self, table: UplinkTable) -> None:
+        """Add the uplinks of ``table`` to their local days.
+
+        Rows are counted every time they are passed in, so pass only new
+        uplinks (see :func:`~jamaica_bay.ingest.ingest`).
+        """
+        self.add(table.local_days(), table.speed, table.dir)
+
+    def add(self, days: np.ndarray, speed: np.ndarray, dir: np.ndarray) -> None:
+        """Count samples by day; those missing a speed or direction are skipped."""
+        days = np.asarray(days, dtype="datetime64[D]")
+        speed = np.asarray(speed, dtype=np.float64)
+        dir = np.asarray(dir, dtype=np.float64)
+        ok = ~np.isnat(days) & np.isfinite(speed) & np.isfinite(dir)
+        days, speed, dir = days[ok], speed[ok], dir[ok]
+        if not days.size:
+            return
+        self._cover(days.min(), days.max())
+        day = (days - self.first_day).astype(np.int64)
+        cls = np.searchsorted(self.speed_edges, speed, side="right")
+        sector = direction_sectors(dir, self.sectors)
+        n_classes = len(self.speed_edges) + 1
+        flat = (day * n_classes + cls) * self.sectors + sector
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def _cover(self, first: np.datetime64, last: np.datetime64) -> None:
+        """Grow ``counts`` with empty days so that it spans ``first..last``."""
+        if self.first_day is None:
+            self.first_day = first
+        lead = max(int((self.first_day - first).astype(np.int64)), 0)
+        trail = max(int((last - self.first_day).astype(np.int64)) + 1 - len(self.counts) - lead, 0)
+        if lead or trail:
+            self.counts = np.pad(self.counts, ((lead, trail), (0, 0), (0, 0)))
+            self.first_day -= lead
+
+    def rose(self, start=None, end=None) -> WindRose:
+        """Rose of the local days in ``[start, end)``; open bounds take all days."""
+        lo = 0 if start is None else self._day_index(start)
+        hi = len(self) if end is None else self._day_index(end)
+        return WindRose(self.counts[lo : max(hi, lo)].sum(axis=0), self.speed_edges)
+
+    def _day_index(self, day) -> int:
+        if self.first_day is None:
+            return 0
+        return min(max(int((np.datetime64(day, "D") - self.first_day).astype(np.int64)), 0), len(self))
+
+    def merge(self, other: DailyRoses) -> None:
+        """Add the counts of ``other``, which must use the same binning."""
+        _check_binning(self.speed_edges, self.sectors, other.speed_edges, other.sectors)
+        if other.first_day is None:
+            return
+        self._cover(other.first_day, other.days[-1])
+        lo = int((other.first_day - self.first_day).astype(np.int64))
+        self.counts[lo : lo + len(other)] += other.counts
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> DailyRoses:
+        with np.load(path, allow_pickle=False) as saved:
+            if int(saved["format"]) != FORMAT_VERSION:
+                raise ValueError(f"unsupported wind rose format {int(saved['format'])!r}")
+            counts = saved["counts"]
+            first_day = saved["first_day"][0] if saved["first_day"].size else None
+            return cls(counts.shape[2], saved["speed_edges"].tolist(), first_day, counts)
+
+    def save(self, path: str | os.PathLike) -> None:
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                format=np.int64(FORMAT_VERSION),
+                counts=self.counts,
+                speed_edges=np.array(self.speed_edges),
+                first_day=np.array([] if self.first_day is None else [self.first_day], dtype="datetime64[D]"),
+            )
+        os.replace(tmp, path)
+
+
+def direction_sectors(dir: np.ndarray, sectors: int = DEFAULT_SECTORS) -> np.ndarray:
+    """Sector of each direction; sector 0 is centred on north."""
+    width = 360.0 / sectors
+    return np.floor((np.asarray(dir, dtype=np.float64) % 360.0) / width + 0.5).astype(np.int64) % sectors
+
+
+def _check_binning(edges_a, sectors_a, edges_b, sectors_b) -> None:
+    if tuple(edges_a) != tuple(edges_b) or sectors_a != sectors_b:
+        raise ValueError("wind roses use different speed classes or sectors")
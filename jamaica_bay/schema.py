@@ -0,0 +1,137 @@
+"""Registry of known export layouts and header sniffing.
+
+Exports come with or without a header row.  :func:`sniff` fingerprints the
+first few kilobytes of an export and returns the registered
+:class:`ExportSchema` it matches, so the parser can be set up once for that
+layout instead of checking every row.  Exports that match no registered
+layout raise :class:`SchemaError` before any parsing is done.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+from dataclasses import dataclass
+
+#: How much of an export :func:`sniff` looks at.
+SNIFF_BYTES = 8192
+
+_KIND_PATTERNS = {
+    "text": re.compile(r".*"),
+    "timestamp": re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(\.\d{1,9})?Z"),
+    "local_time": re.compile(r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d\d:\d\d"),
+    "int": re.compile(r"-?\d+"),
+    "float": re.compile(r"-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?"),
+}
+
+
+class SchemaError(ValueError):
+    """An export does not match any registered layout."""
+
+
+@dataclass(frozen=True)
+class ExportSchema:
+    """Column layout of one export format.
+
+    ``header`` is the header row as written by the exporter and ``kinds``
+    the value kind of each column (a key of the sniffing patterns).
+    ``fields`` maps uplink field names to column positions and
+    ``reception_groups`` lists the ``(gtw_id, time, rssi, snr)`` positions of
+    every reception group.
+    """
+
+    name: str
+    header: tuple[str, ...]
+    kinds: tuple[str, ...]
+    fields: dict[str, int]
+    reception_groups: tuple[tuple[int, int, int, int], ...]
+
+    @property
+    def n_fields(self) -> int:
+        return len(self.header)
+
+    @property
+    def header_line(self) -> bytes:
+        return ",".join(self.header).encode()
+
+    def matches_row(self, row: list[str]) -> bool:
+        """Whether ``row`` fits this layout's width and value kinds.
+
+        Rows may stop short after the uplink fields, as when trailing empty
+        reception groups are trimmed.
+        """
+        if not max(self.fields.values()) < len(row) <= self.n_fields:
+            return False
+        return all(not v or _KIND_PATTERNS[k].fullmatch(v) for v, k in zip(row, self.kinds))
+
+
+_REGISTRY: dict[str, ExportSchema] = {}
+
+
+def register(schema: ExportSchema) -> ExportSchema:
+    """Add ``schema`` to the registry consulted by :func:`sniff`."""
+    _REGISTRY[schema.name] = schema
+    return schema
+
+
+def registered() -> tuple[ExportSchema, ...]:
+    return tuple(_REGISTRY.values())
+
+
+def sniff(head: bytes) -> tuple[ExportSchema, bool]:
+    """Identify the layout of an export from its first bytes.
+
+    Returns the schema and whether the export starts with a header row.  A
+    header-less export matches a schema when no sampled row is wider than the
+    schema and most rows fit its value kinds; the stray non-uplink row is
+    tolerated.
+    """
+    head = head[:SNIFF_BYTES]
+    first = head.split(b"\n", 1)[0].rstrip(b"\r")
+    for schema in _REGISTRY.values():
+        if first == schema.header_line:
+            return schema, True
+
+    lines = head.decode("utf-8", "replace").splitlines()
+    if len(head) == SNIFF_BYTES:
+        # The last line is probably cut short.
+        lines = lines[:-1]
+    rows = [row for row in csv.reader(io.StringIO("\n".join(lines))) if row]
+    for schema in _REGISTRY.values():
+        if rows and all(len(r) <= schema.n_fields for r in rows):
+            if 2 * sum(schema.matches_row(r) for r in rows) > len(rows):
+                return schema, False
+    raise SchemaError(f"export does not match any registered layout; first line: {first[:120]!r}")
+
+
+def _uplink_v1() -> ExportSchema:
+    uplink = [
+        ("device_id", "device_id", "text"),
+        ("application_id", "application_id", "text"),
+        ("received_at utc", "received_at", "timestamp"),
+        ("local_time", "local_time", "local_time"),
+        ("f_cnt", "f_cnt", "int"),
+        ("batteryVoltage", "battery_voltage", "float"),
+        ("dir", "dir", "float"),
+        ("humidity", "humidity", "float"),
+        ("pressure", "pressure", "float"),
+        ("speed", "speed", "float"),
+        ("temperature", "temperature", "float"),
+    ]
+    group = [("gtw_id", "text"), ("time", "timestamp"), ("rssi", "int"), ("snr", "float")]
+    n_groups = 7
+    header = [h for h, _, _ in uplink] + [h for h, _ in group] * n_groups
+    kinds = [k for _, _, k in uplink] + [k for _, k in group] * n_groups
+    first = len(uplink)
+    return ExportSchema(
+        name="uplink-v1",
+        header=tuple(header),
+        kinds=tuple(kinds),
+        fields={name: i for i, (_, name, _) in enumerate(uplink)},
+        reception_groups=tuple(tuple(range(first + 4 * g, first + 4 * g + 4)) for g in range(n_groups)),
+    )
+
+
+#: The 39-column uplink export: eleven uplink fields and seven reception groups.
+UPLINK_V1 = register(_uplink_v1())
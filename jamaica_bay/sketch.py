@@ -0,0 +1,145 @@
+"""Mergeable KLL quantile sketches.
+
+A :class:`KLLSketch` summarises a stream of values in ``O(k log(n/k))`` space
+and answers any quantile to within about ``4 / k`` in rank.  Sketches of
+separate parts of the data merge into a sketch of the union, so one sketch per
+day partition is enough to answer percentiles over any range of days without
+touching the values again.
+
+Values enter level 0.  When a level outgrows its capacity it is sorted and
+every other item, starting at an alternating offset, is promoted to the next
+level with twice the weight.  Capacities shrink geometrically towards the
+lower levels, which bounds the total size.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+
+import numpy as np
+
+#: Accuracy parameter: rank error is about ``4 / k``, i.e. 1% at the default.
+DEFAULT_K = 400
+
+FORMAT_VERSION = 1
+
+_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """Approximate quantiles of the finite values added so far."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self._levels: list[np.ndarray] = [np.empty(0)]
+        self._offsets: list[int] = [0]
+
+    def __len__(self) -> int:
+        return self.n
+
+    @classmethod
+    def of(cls, values, k: int = DEFAULT_K) -> KLLSketch:
+        sketch = cls(k)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def size(self) -> int:
+        """Number of items retained."""
+        return sum(len(level) for level in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(2, math.ceil(self.k * _DECAY**depth))
+
+    def update(self, values) -> None:
+        """Add values; NaNs and infinities are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if values.size:
+            self.n += values.size
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        """Fold ``other`` into this sketch."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+            self._offsets.append(0)
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            items = self._levels[h]
+            if len(items) <= self._capacity(h):
+                h += 1
+                continue
+            if h + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+                self._offsets.append(0)
+            items = np.sort(items)
+            # An odd item out stays behind at this level.
+            even = len(items) - len(items) % 2
+            offset = self._offsets[h]
+            self._offsets[h] ^= 1
+            self._levels[h] = items[even:]
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], items[offset:even:2]])
+            # A new top level shrinks every capacity below it; start over.
+            h = 0
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 1 << h, dtype=np.int64) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Value at quantile(s) ``q`` in ``[0, 1]``; NaN for an empty sketch."""
+        q = np.asarray(q, dtype=np.float64)
+        if not self.n:
+            return np.full(q.shape, np.nan)[()]
+        items, cumulative = self._weighted()
+        target = np.clip(q, 0.0, 1.0) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, target, side="left"), len(items) - 1)
+        return items[index][()]
+
+    def rank(self, x):
+        """Approximate fraction of values ``<= x``."""
+        if not self.n:
+            return np.full(np.shape(x), np.nan)[()]
+        items, cumulative = self._weighted()
+        below = np.searchsorted(items, np.asarray(x, dtype=np.float64), side="right")
+        return (np.r_[0, cumulative][below] / cumulative[-1])[()]
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> KLLSketch:
+        with np.load(path, allow_pickle=False) as saved:
+            if int(saved["format"]) != FORMAT_VERSION:
+                raise ValueError(f"unsupported sketch format {int(saved['format'])!r}")
+            sketch = cls(int(saved["k"]))
+            sketch.n = int(saved["n"])
+            bounds = np.cumsum(np.r_[0, saved["sizes"]])
+            items = saved["items"]
+            sketch._levels = [items[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+            sketch._offsets = saved["offsets"].tolist()
+        return sketch
+
+    def save(self, path: str | os.PathLike) -> None:
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                format=np.int64(FORMAT_VERSION),
+                k=np.int64(self.k),
+                n=np.int64(self.n),
+                sizes=np.array([len(level) for level in self._levels], dtype=np.int64),
+                items=np.concatenate(self._levels),
+                offsets=np.array(self._offsets, dtype=np.int64),
+            )
+        os.replace(tmp, path)
@@ -0,0 +1,123 @@
+"""Memory-mapped float32 channel store.
+
+A store holds the time series of one device as flat binary files::
+
+    <root>/meta.json
+    <root>/received_at.i64     int64 ns since the epoch, ascending
+    <root>/speed.f32           one float32 per uplink, same order
+    ...
+
+Each file is opened with :class:`numpy.memmap`, so opening a store costs the
+same however long its history is, and processes reading the same store share
+its pages through the OS page cache.  Values are kept as the float32 the
+sensor reported, which round-trips them exactly at half the size of float64.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .table import CHANNELS, UplinkTable
+
+META = "meta.json"
+FORMAT_VERSION = 1
+
+
+class ChannelStore:
+    """Append-only, time-ordered float32 channels of one device."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+        with open(self.root / META) as fh:
+            meta = json.load(fh)
+        if meta["format"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported channel store format {meta['format']!r}")
+        self.device_id: str = meta["device_id"]
+        self.channels: tuple[str, ...] = tuple(meta["channels"])
+        self._length: int = meta["length"]
+        self._maps: dict[str, np.memmap] = {}
+
+    @classmethod
+    def create(cls, root: str | os.PathLike, device_id: str, channels=CHANNELS) -> ChannelStore:
+        """Create an empty store for ``device_id`` at ``root``."""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        for name in ("received_at.i64", *(f"{c}.f32" for c in channels)):
+            (root / name).touch()
+        _write_meta(root, {"format": FORMAT_VERSION, "device_id": device_id, "channels": list(channels), "length": 0})
+        return cls(root)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _map(self, name: str, dtype) -> np.ndarray:
+        if not self._length:
+            return np.empty(0, dtype=dtype)
+        if name not in self._maps:
+            self._maps[name] = np.memmap(self.root / name, dtype=dtype, mode="r", shape=(self._length,))
+        return self._maps[name]
+
+    @property
+    def received_at(self) -> np.ndarray:
+        return self._map("received_at.i64", np.int64).view("datetime64[ns]")
+
+    def channel(self, name: str) -> np.ndarray:
+        """The float32 values of channel ``name``, memory-mapped."""
+        if name not in self.channels:
+            raise KeyError(name)
+        return self._map(f"{name}.f32", np.float32)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.received_at if name == "received_at" else self.channel(name)
+
+    def append(self, table: UplinkTable) -> int:
+        """Append this device's rows of ``table`` that are newer than the store.
+
+        Rows are sorted by ``received_at``; rows at or before the last stored
+        time are skipped, so re-appending overlapping exports is harmless.
+        Duplicates within ``table`` are kept, so pass it through
+        :func:`~jamaica_bay.dedup.deduplicate` first.  Returns the number of
+        rows written.
+        """
+        rows = table.device_id == table.device_code(self.device_id)
+        t = table.received_at[rows].view(np.int64)
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+        if self._length:
+            t_last = int(self.received_at[-1].view(np.int64))
+            new = t > t_last
+            order, t = order[new], t[new]
+        if not t.size:
+            return 0
+
+        # Data first, then the length in meta.json: readers never see rows
+        # whose values are not on disk yet.  Truncating first discards the
+        # leftovers of an append that died before updating meta.json.
+        for c in self.channels:
+            values = getattr(table, c)[rows][order].astype("<f4")
+            _append(self.root / f"{c}.f32", self._length * 4, values.tobytes())
+        _append(self.root / "received_at.i64", self._length * 8, t.astype("<i8").tobytes())
+        self._length += t.size
+        self._maps.clear()
+        _write_meta(
+            self.root,
+            {"format": FORMAT_VERSION, "device_id": self.device_id, "channels": list(self.channels), "length": self._length},
+        )
+        return int(t.size)
+
+
+def _append(path: Path, size: int, data: bytes) -> None:
+    os.truncate(path, size)
+    with open(path, "ab") as fh:
+        fh.write(data)
+
+
+def _write_meta(root: Path, meta: dict) -> None:
+    tmp = root / f"{META}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp, root / META)
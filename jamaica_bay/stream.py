@@ -0,0 +1,101 @@
+"""Bounded-memory streaming over exports of any size.
+
+:func:`iter_batches` reads an export in fixed-size byte blocks, cuts each
+block at its last record boundary (a newline outside double quotes) and
+parses the complete records with the same vectorized parser as
+:func:`~jamaica_bay.loader.load_export`.  The unfinished tail is carried into
+the next block, so quoted fields and ragged rows that straddle a block edge
+come out exactly as in a whole-file parse.  Memory use is bounded by the
+block size plus one batch, whatever the size of the export.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+
+import numpy as np
+
+from . import _csv
+from .loader import parse_buffer
+from .schema import SNIFF_BYTES, ExportSchema, sniff
+from .table import EventTable, UplinkTable
+
+DEFAULT_BATCH_ROWS = 65_536
+DEFAULT_BLOCK_BYTES = 8 << 20
+
+
+def record_end(data: bytes) -> int:
+    """Length of the longest prefix of ``data`` made of complete records.
+
+    ``data`` must start at a record boundary.  Returns 0 when not even one
+    record is complete.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == _csv.NEWLINE)
+    if not newlines.size:
+        return 0
+    quotes = np.flatnonzero(buf == _csv.QUOTE)
+    if quotes.size:
+        newlines = newlines[(np.searchsorted(quotes, newlines) & 1) == 0]
+        if not newlines.size:
+            return 0
+    return int(newlines[-1]) + 1
+
+
+def iter_records(
+    path: str | os.PathLike, block_bytes: int = DEFAULT_BLOCK_BYTES, start: int = 0, stop: int | None = None
+) -> Iterator[bytes]:
+    """Yield successive runs of complete records from ``path``.
+
+    Reading starts at byte ``start``, which must be a record boundary, and
+    ends at ``stop`` (default: end of file), which must be one too.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = None if stop is None else stop - start
+        carry = b""
+        while True:
+            size = block_bytes if remaining is None else min(block_bytes, remaining)
+            block = fh.read(size) if size > 0 else b""
+            if remaining is not None:
+                remaining -= len(block)
+            if not block:
+                if carry:
+                    yield carry
+                return
+            data = carry + block
+            end = record_end(data)
+            if end:
+                yield data[:end]
+            carry = data[end:]
+
+
+def iter_batches(
+    path: str | os.PathLike,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    schema: ExportSchema | None = None,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> Iterator[UplinkTable]:
+    """Yield the uplinks of ``path`` in batches of ``batch_rows`` rows.
+
+    Every batch but the last has exactly ``batch_rows`` rows.  Annotation
+    rows are attached to the batch they were read with, as ``events``.
+    """
+    if schema is None:
+        with open(path, "rb") as fh:
+            schema, _ = sniff(fh.read(SNIFF_BYTES))
+    pending: list[UplinkTable] = []
+    n_pending = 0
+    for records in iter_records(path, block_bytes):
+        table = parse_buffer(records, schema)
+        pending.append(table)
+        n_pending += len(table)
+        while n_pending >= batch_rows:
+            merged = UplinkTable.concat(pending) if len(pending) > 1 else pending[0]
+            yield merged.take(slice(0, batch_rows))
+            rest = merged.take(slice(batch_rows, None))
+            rest.events = EventTable.empty(rest.dictionary)
+            pending, n_pending = [rest], len(rest)
+    if n_pending:
+        yield UplinkTable.concat(pending) if len(pending) > 1 else pending[0]
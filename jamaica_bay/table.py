@@ -0,0 +1,311 @@
+"""Columnar containers for parsed uplink exports."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from .categorical import DEFAULT_DICTIONARY, Dictionary
+
+#: Float32 sensor channels, in export column order.
+CHANNELS = ("battery_voltage", "dir", "humidity", "pressure", "speed", "temperature")
+
+#: ``rssi`` value of a reception whose RSSI field was empty.
+MISSING_RSSI = np.iinfo(np.int16).min
+
+
+def _default_dictionary() -> Dictionary:
+    return DEFAULT_DICTIONARY
+
+
+@dataclass
+class ReceptionTable:
+    """Long-format gateway receptions, one row per (uplink, gateway) pair.
+
+    ``uplink`` indexes rows of the owning :class:`UplinkTable` and
+    ``gateway`` holds codes of gateway names in ``dictionary``.
+    """
+
+    uplink: np.ndarray
+    gateway: np.ndarray
+    time: np.ndarray
+    rssi: np.ndarray
+    snr: np.ndarray
+    dictionary: Dictionary = field(default_factory=_default_dictionary, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.uplink)
+
+    @classmethod
+    def column_names(cls) -> list[str]:
+        return [f.name for f in fields(cls) if f.name != "dictionary"]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.column_names()}
+
+    def take(self, index) -> ReceptionTable:
+        return ReceptionTable(**{name: col[index] for name, col in self.columns().items()}, dictionary=self.dictionary)
+
+    def gateway_code(self, name: str | bytes) -> int:
+        """Return the code of gateway ``name``, or -1 if it is unknown."""
+        return self.dictionary.code(name)
+
+    def for_gateway(self, name: str | bytes) -> ReceptionTable:
+        """Return the receptions heard by gateway ``name``."""
+        return self.take(self.gateway == self.gateway_code(name))
+
+    def gateway_names(self) -> np.ndarray:
+        """Return the gateway name of every reception."""
+        return self.dictionary.decode(self.gateway)
+
+    @classmethod
+    def empty(cls, dictionary: Dictionary = DEFAULT_DICTIONARY) -> ReceptionTable:
+        return cls(
+            uplink=np.empty(0, dtype=np.int64),
+            gateway=np.empty(0, dtype=np.int32),
+            time=np.empty(0, dtype="datetime64[ns]"),
+            rssi=np.empty(0, dtype=np.int16),
+            snr=np.empty(0, dtype=np.float32),
+            dictionary=dictionary,
+        )
+
+    @classmethod
+    def concat(cls, tables: list[ReceptionTable], offsets: list[int]) -> ReceptionTable:
+        """Stack ``tables``, shifting each one's ``uplink`` by its offset.
+
+        Gateway codes are translated into the first table's dictionary.
+        """
+        if not tables:
+            return cls.empty()
+        dictionary = tables[0].dictionary
+        return cls(
+            uplink=np.concatenate([t.uplink + off for t, off in zip(tables, offsets)]),
+            gateway=np.concatenate([dictionary.translate(t.gateway, t.dictionary) for t in tables]),
+            time=np.concatenate([t.time for t in tables]),
+            rssi=np.concatenate([t.rssi for t in tables]),
+            snr=np.concatenate([t.snr for t in tables]),
+            dictionary=dictionary,
+        )
+
+
+@dataclass
+class EventTable:
+    """Free-text annotation rows found among the uplinks.
+
+    Field notes such as a sensor setup are typed into the ``f_cnt`` column of
+    an otherwise ordinary row.  ``location`` is the first field after it
+    holding a comma, empty when there is none; ``latitude``/``longitude``
+    are decoded from it when it reads ``"lat, lon"`` and are NaN otherwise.
+    ``device_id`` holds codes in ``dictionary``.
+    """
+
+    device_id: np.ndarray
+    received_at: np.ndarray
+    local_time: np.ndarray
+    text: np.ndarray
+    location: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    dictionary: Dictionary = field(default_factory=_default_dictionary, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.received_at)
+
+    @classmethod
+    def column_names(cls) -> list[str]:
+        return [f.name for f in fields(cls) if f.name != "dictionary"]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.column_names()}
+
+    def take(self, index) -> EventTable:
+        return EventTable(**{name: col[index] for name, col in self.columns().items()}, dictionary=self.dictionary)
+
+    def boundaries(self, device: int) -> np.ndarray:
+        """Sorted ``received_at`` of the notes of one device code."""
+        return np.sort(self.received_at[self.device_id == device])
+
+    def epochs(self, device_id: np.ndarray, received_at: np.ndarray) -> np.ndarray:
+        """Deployment epoch of uplinks given by device code and receive time.
+
+        The epoch counts the device's notes received at or before the uplink,
+        so every setup note opens a new epoch.
+        """
+        epochs = np.zeros(len(device_id), dtype=np.int64)
+        for device in np.unique(self.device_id):
+            rows = device_id == device
+            epochs[rows] = np.searchsorted(self.boundaries(device), received_at[rows], side="right")
+        return epochs
+
+    @classmethod
+    def empty(cls, dictionary: Dictionary = DEFAULT_DICTIONARY) -> EventTable:
+        return cls(
+            device_id=np.empty(0, dtype=np.int32),
+            received_at=np.empty(0, dtype="datetime64[ns]"),
+            local_time=np.empty(0, dtype="datetime64[ns]"),
+            text=np.empty(0, dtype="S1"),
+            location=np.empty(0, dtype="S1"),
+            latitude=np.empty(0, dtype=np.float64),
+            longitude=np.empty(0, dtype=np.float64),
+            dictionary=dictionary,
+        )
+
+    @classmethod
+    def concat(cls, tables: list[EventTable]) -> EventTable:
+        """Stack ``tables`` in time order, dropping notes repeated across exports.
+
+        Device codes are translated into the first table's dictionary.
+        """
+        if not tables:
+            return cls.empty()
+        dictionary = tables[0].dictionary
+        columns = {name: np.concatenate([getattr(t, name) for t in tables]) for name in cls.column_names()}
+        columns["device_id"] = np.concatenate([dictionary.translate(t.device_id, t.dictionary) for t in tables])
+        merged = cls(**columns, dictionary=dictionary)
+        if not len(merged):
+            return merged
+        order = np.lexsort((merged.text, merged.device_id, merged.received_at))
+        merged = merged.take(order)
+        repeat = np.r_[
+            False,
+            (merged.received_at[1:] == merged.received_at[:-1])
+            & (merged.device_id[1:] == merged.device_id[:-1])
+            & (merged.text[1:] == merged.text[:-1]),
+        ]
+        return merged.take(~repeat)
+
+
+@dataclass
+class UplinkTable:
+    """One row per uplink, one NumPy array per column.
+
+    ``device_id`` and ``application_id`` hold codes in ``dictionary``, which
+    the attached receptions and events share.  ``local_time`` is the
+    logger's America/New_York wall-clock time and ``utc_offset`` the UTC
+    offset in minutes in force at ``received_at``.  ``receptions`` holds the
+    gateway receptions of these uplinks and ``events`` the annotation rows
+    that were found alongside them.
+    """
+
+    device_id: np.ndarray
+    application_id: np.ndarray
+    received_at: np.ndarray
+    local_time: np.ndarray
+    utc_offset: np.ndarray
+    f_cnt: np.ndarray
+    battery_voltage: np.ndarray
+    dir: np.ndarray
+    humidity: np.ndarray
+    pressure: np.ndarray
+    speed: np.ndarray
+    temperature: np.ndarray
+    receptions: ReceptionTable = field(default_factory=ReceptionTable.empty, repr=False)
+    events: EventTable = field(default_factory=EventTable.empty, repr=False)
+    dictionary: Dictionary = field(default_factory=_default_dictionary, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.received_at)
+
+    @classmethod
+    def column_names(cls) -> list[str]:
+        """Names of the row-aligned columns."""
+        return [f.name for f in fields(cls) if f.name not in _ATTACHED]
+
+    @classmethod
+    def empty(cls, dictionary: Dictionary = DEFAULT_DICTIONARY) -> UplinkTable:
+        dtypes = {
+            "device_id": np.int32,
+            "application_id": np.int32,
+            "received_at": "datetime64[ns]",
+            "local_time": "datetime64[ns]",
+            "utc_offset": np.int16,
+            "f_cnt": np.int64,
+        }
+        return cls(
+            **{name: np.empty(0, dtype=dtypes.get(name, np.float32)) for name in cls.column_names()},
+            receptions=ReceptionTable.empty(dictionary),
+            events=EventTable.empty(dictionary),
+            dictionary=dictionary,
+        )
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Return the columns as an ordered ``name -> array`` mapping."""
+        return {name: getattr(self, name) for name in self.column_names()}
+
+    def device_code(self, name: str | bytes) -> int:
+        """Code of device ``name``, or -1 if it is unknown."""
+        return self.dictionary.code(name)
+
+    def for_device(self, name: str | bytes) -> UplinkTable:
+        """Return the uplinks of device ``name``."""
+        return self.take(self.device_id == self.device_code(name))
+
+    def device_names(self) -> np.ndarray:
+        """Return the device name of every uplink."""
+        return self.dictionary.decode(self.device_id)
+
+    def recode(self, dictionary: Dictionary) -> UplinkTable:
+        """Return this table with its codes translated into ``dictionary``."""
+        if dictionary is self.dictionary:
+            return self
+        return UplinkTable.concat([UplinkTable.empty(dictionary), self])
+
+    def local_received_at(self) -> np.ndarray:
+        """``received_at`` on the America/New_York wall clock."""
+        return self.received_at + self.utc_offset.astype("timedelta64[m]")
+
+    def local_days(self) -> np.ndarray:
+        """Local calendar day of each uplink's ``received_at``."""
+        return self.local_received_at().astype("datetime64[D]")
+
+    def deployments(self) -> np.ndarray:
+        """Deployment epoch of each uplink, see :meth:`EventTable.epochs`."""
+        return self.events.epochs(self.device_id, self.received_at)
+
+    def take(self, index) -> UplinkTable:
+        """Return the rows selected by ``index`` (mask, slice or positions).
+
+        Receptions follow their uplinks; if a row is selected more than once
+        its receptions are attached to the last copy.
+        """
+        rows = np.arange(len(self))[index]
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[rows] = np.arange(rows.size)
+        new_uplink = remap[self.receptions.uplink]
+        kept = new_uplink >= 0
+        receptions = self.receptions.take(kept)
+        receptions.uplink = new_uplink[kept]
+        return UplinkTable(
+            **{name: col[index] for name, col in self.columns().items()},
+            receptions=receptions,
+            events=self.events,
+            dictionary=self.dictionary,
+        )
+
+    @classmethod
+    def concat(cls, tables: list[UplinkTable]) -> UplinkTable:
+        """Stack ``tables`` row-wise.
+
+        Codes are translated into the first table's dictionary; when all
+        tables share it, as they do by default, no translation is needed.
+        """
+        if not tables:
+            return cls.empty()
+        dictionary = tables[0].dictionary
+        columns = {name: np.concatenate([getattr(t, name) for t in tables]) for name in cls.column_names()}
+        for name in _CODED:
+            columns[name] = np.concatenate([dictionary.translate(getattr(t, name), t.dictionary) for t in tables])
+        offsets = np.cumsum([0] + [len(t) for t in tables[:-1]]).tolist()
+        return cls(
+            **columns,
+            receptions=ReceptionTable.concat([t.receptions for t in tables], offsets),
+            events=EventTable.concat([t.events for t in tables]),
+            dictionary=dictionary,
+        )
+
+
+# Tables attached to an UplinkTable rather than being row-aligned columns.
+_ATTACHED = ("receptions", "events", "dictionary")
+# Columns holding dictionary codes.
+_CODED = ("device_id", "application_id")
@@ -0,0 +1,243 @@
+"""Fixed-format timestamp decoding straight from export bytes.
+
+``received_at`` values look like ``2025-08-06T00:02:59.268935556Z`` and the
+gateway ``time`` columns mix second, millisecond, microsecond and nanosecond
+precision.  Both are decoded arithmetically from the digit bytes, a whole
+column at a time, into int64 nanoseconds since the Unix epoch.
+
+``local_time`` is unpadded US-format wall-clock time in America/New_York
+(``8/5/2025 20:03:03``).  It is decoded the same way, and its UTC offset is
+resolved against a cached table of DST transitions.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from . import _csv
+
+#: int64 value NumPy uses for ``NaT``.
+NAT = np.iinfo(np.int64).min
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# Longest accepted value: YYYY-MM-DDTHH:MM:SS.nnnnnnnnnZ
+_WIDTH = 30
+_FRACTION = 20
+_SEPARATORS = {4: b"-", 7: b"-", 10: b"T", 13: b":", 16: b":"}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_RFC3339 = re.compile(r"(\d{4}-\d\d-\d\d)T\d\d:\d\d:\d\d(?:\.(\d{0,9}))?Z", re.ASCII)
+_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18] + list(range(_FRACTION, _FRACTION + 9))
+
+
+def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of proleptic Gregorian dates (vectorized)."""
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146_097 + doe - 719_468
+
+
+def _in_range(year, month, day, hour, minute, second) -> np.ndarray:
+    """Mask of dates and times whose fields are all within range."""
+    month_ok = (month >= 1) & (month <= 12)
+    month = np.where(month_ok, month, 1)
+    month_days = days_from_civil(year, month + 1, 1) - days_from_civil(year, month, 1)
+    return month_ok & (day >= 1) & (day <= month_days) & (hour <= 23) & (minute <= 59) & (second <= 59)
+
+
+def _number(m: np.ndarray, first: int, last: int) -> np.ndarray:
+    """Decimal value of digit columns ``first..last`` of a field matrix."""
+    value = m[:, first].astype(np.int64) - _csv.ZERO
+    for i in range(first + 1, last + 1):
+        value = value * 10 + m[:, i] - _csv.ZERO
+    return value
+
+
+def parse_rfc3339(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Decode ``YYYY-MM-DDTHH:MM:SS[.f{1,9}]Z`` fields to int64 epoch ns.
+
+    Empty fields decode to :data:`NAT`; anything else that does not fit the
+    format or has a field out of range, such as month 13 or hour 24, raises
+    ``ValueError``.
+    """
+    out = np.full(starts.shape, NAT, dtype=np.int64)
+    present = np.flatnonzero(ends > starts)
+    if not present.size:
+        return out
+    s, e = starts[present], ends[present]
+    length = e - s
+    m = _csv.field_matrix(buf, s, e, width=_WIDTH)
+
+    valid = (length >= _FRACTION) & (length <= _WIDTH) & (m[np.arange(len(m)), length - 1] == ord("Z"))
+    valid &= (length == _FRACTION) | (m[:, _FRACTION - 1] == ord("."))
+
+    # Pad the fraction to nine digits so every value has the same layout.
+    n_frac = np.maximum(length - _FRACTION - 1, 0)
+    frac = m[:, _FRACTION : _FRACTION + 9]
+    frac[np.arange(9) >= n_frac[:, None]] = _csv.ZERO
+    for i, sep in _SEPARATORS.items():
+        valid &= m[:, i] == sep[0]
+    digits = m[:, _DIGITS] - np.uint8(_csv.ZERO)
+    valid &= (digits <= 9).all(axis=1)
+    year, month, day = _number(m, 0, 3), _number(m, 5, 6), _number(m, 8, 9)
+    hour, minute, second = _number(m, 11, 12), _number(m, 14, 15), _number(m, 17, 18)
+    valid &= _in_range(year, month, day, hour, minute, second)
+    if not valid.all():
+        bad = np.flatnonzero(~valid)[0]
+        raise ValueError(f"not an RFC 3339 UTC timestamp: {bytes(buf[s[bad] : e[bad]])!r}")
+
+    seconds = hour * 3600 + minute * 60 + second
+    out[present] = (
+        days_from_civil(year, month, day) * NS_PER_DAY + seconds * NS_PER_SECOND + _number(m, _FRACTION, _FRACTION + 8)
+    )
+    return out
+
+
+def rfc3339_ns(text: str) -> int:
+    """Decode one RFC 3339 UTC timestamp, as :func:`parse_rfc3339` does a column.
+
+    Meant for per-message paths; an empty string decodes to :data:`NAT`.
+    """
+    if not text:
+        return NAT
+    m = _RFC3339.fullmatch(text)
+    if m is None:
+        raise ValueError(f"not an RFC 3339 UTC timestamp: {text!r}")
+    hour, minute, second = int(text[11:13]), int(text[14:16]), int(text[17:19])
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"not an RFC 3339 UTC timestamp: {text!r}")
+    seconds = hour * 3600 + minute * 60 + second
+    fraction = m.group(2)
+    nanos = int(fraction.ljust(9, "0")) if fraction else 0
+    return _epoch_day(m.group(1)) * NS_PER_DAY + seconds * NS_PER_SECOND + nanos
+
+
+@lru_cache(maxsize=1024)
+def _epoch_day(ymd: str) -> int:
+    return date(int(ymd[0:4]), int(ymd[5:7]), int(ymd[8:10])).toordinal() - _EPOCH_ORDINAL
+
+
+def parse_local_time(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Decode unpadded ``M/D/YYYY H:MM:SS`` wall-clock fields to int64 ns.
+
+    The result counts nanoseconds as if the wall clock were UTC; apply
+    :func:`eastern_utc_offset` to place it in time.  Empty fields decode to
+    :data:`NAT`; anything else that does not fit the format or has a field
+    out of range raises ``ValueError``.
+    """
+    out = np.full(starts.shape, NAT, dtype=np.int64)
+    present = np.flatnonzero(ends > starts)
+    if not present.size:
+        return out
+    s, e = starts[present], ends[present]
+    length = e - s
+    m = _csv.field_matrix(buf, s, e, width=19)
+    rows = np.arange(len(m))
+    cols = np.arange(m.shape[1])
+
+    slash = m == ord("/")
+    slash1 = np.argmax(slash, axis=1)
+    slash2 = np.argmax(slash & (cols > slash1[:, None]), axis=1)
+    space = np.argmax(m == ord(" "), axis=1)
+    colon = np.argmax(m == ord(":"), axis=1)
+    valid = (
+        (slash1 >= 1) & (slash1 <= 2)
+        & (slash2 - slash1 >= 2) & (slash2 - slash1 <= 3)
+        & (space == slash2 + 5)
+        & (colon - space >= 2) & (colon - space <= 3)
+        & (length == colon + 6)
+        & (m[rows, np.minimum(colon + 3, 18)] == ord(":"))
+    )
+    separator = (cols == slash1[:, None]) | (cols == slash2[:, None]) | (cols == space[:, None])
+    separator |= (cols == colon[:, None]) | (cols == colon[:, None] + 3)
+    digit = (m >= _csv.ZERO) & (m <= _csv.NINE)
+    valid &= (digit | separator | (cols >= length[:, None])).all(axis=1)
+
+    d = m.astype(np.int64) - _csv.ZERO
+
+    def number(end, width):
+        """Value of the ``width`` digits ending just before column ``end``."""
+        value = np.zeros(len(m), dtype=np.int64)
+        for k in range(width):
+            value = value * 10 + d[rows, end - width + k]
+        return value
+
+    def one_or_two(end, start):
+        """Value of the one or two digits in columns ``start..end-1``."""
+        tens = np.where(end - start == 2, d[rows, start], 0)
+        return tens * 10 + d[rows, end - 1]
+
+    month = one_or_two(slash1, np.zeros(len(m), dtype=np.int64))
+    day = one_or_two(slash2, slash1 + 1)
+    year = number(space, 4)
+    hour = one_or_two(colon, space + 1)
+    minute = number(colon + 3, 2)
+    second = number(colon + 6, 2)
+    valid &= _in_range(year, month, day, hour, minute, second)
+    if not valid.all():
+        bad = np.flatnonzero(~valid)[0]
+        raise ValueError(f"not an M/D/YYYY H:MM:SS local time: {bytes(buf[s[bad] : e[bad]])!r}")
+
+    seconds = hour * 3600 + minute * 60 + second
+    out[present] = days_from_civil(year, month, day) * NS_PER_DAY + seconds * NS_PER_SECOND
+    return out
+
+
+#: Standard-time and daylight-time UTC offsets of America/New_York, in seconds.
+EST = -5 * 3600
+EDT = -4 * 3600
+
+
+@lru_cache(maxsize=None)
+def eastern_transitions(first_year: int, last_year: int) -> tuple[np.ndarray, np.ndarray]:
+    """US Eastern DST transitions for ``first_year..last_year``.
+
+    Returns ``(utc, wall)``: flat sorted arrays ``[start, end, start, end,
+    ...]`` of the instants daylight time begins and ends, in UTC ns and in
+    local wall-clock ns.  Uses the rules in force since 2007: 02:00 on the
+    second Sunday of March to 02:00 on the first Sunday of November.
+    """
+    years = np.arange(first_year, last_year + 1, dtype=np.int64)
+
+    def first_sunday_on_or_after(month, day):
+        days = days_from_civil(years, np.full_like(years, month), np.full_like(years, day))
+        weekday = (days + 3) % 7  # Monday == 0; 1970-01-01 was a Thursday.
+        return days + (6 - weekday) % 7
+
+    start = first_sunday_on_or_after(3, 8) * NS_PER_DAY + 2 * 3600 * NS_PER_SECOND
+    end = first_sunday_on_or_after(11, 1) * NS_PER_DAY + 2 * 3600 * NS_PER_SECOND
+    wall = np.column_stack([start, end]).ravel()
+    utc = np.column_stack([start - EST * NS_PER_SECOND, end - EDT * NS_PER_SECOND]).ravel()
+    return utc, wall
+
+
+def eastern_utc_offset(wall: np.ndarray, utc: np.ndarray | None = None) -> np.ndarray:
+    """UTC offset in seconds of America/New_York for each value.
+
+    Wherever the matching UTC instant ``utc`` is known the offset follows
+    from it unambiguously.  Otherwise it is looked up from the wall-clock
+    time; in the repeated hour of the November fall-back the first (daylight)
+    occurrence is assumed, and skipped March times are taken as daylight.
+    Values with neither time are given standard time.
+    """
+    wall = np.asarray(wall, dtype=np.int64)
+    known = wall != NAT if utc is None else (wall != NAT) | (utc != NAT)
+    if not known.any():
+        return np.full(wall.shape, EST, dtype=np.int32)
+    probe = np.where(wall != NAT, wall, utc) if utc is not None else wall
+    years = (probe[known] // NS_PER_DAY).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+    table_utc, table_wall = eastern_transitions(int(years.min()), int(years.max()))
+
+    dst = (np.searchsorted(table_wall, wall, side="right") & 1) == 1
+    if utc is not None:
+        from_utc = (np.searchsorted(table_utc, utc, side="right") & 1) == 1
+        dst = np.where(utc != NAT, from_utc, dst)
+    return np.where(dst & known, EDT, EST).astype(np.int32)
@@ -0,0 +1,160 @@
+"""Batched Weibull fits of wind speed.
+
+Wind-resource summaries fit a Weibull distribution
+
+    F(x) = 1 - exp(-(x / c) ** k)
+
+to the speeds of every month, direction sector or hour of day, often hundreds
+of groups at once.  All groups are fitted together: the per-group sums the
+maximum-likelihood equation needs are ``np.bincount`` reductions over the
+samples, and one vectorized Newton step updates every group's shape ``k`` at
+once.  Speeds are divided by their group mean first, which keeps ``x ** k``
+in range without changing ``k``.
+
+Calms (speed 0) have no Weibull likelihood; they are left out of the fit and
+counted separately, as is usual for wind climatologies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from math import gamma
+
+import numpy as np
+
+from .rose import DEFAULT_SECTORS, direction_sectors
+from .table import UplinkTable
+
+#: Groups with fewer non-calm samples than this are not fitted (NaN).
+DEFAULT_MIN_SAMPLES = 10
+
+_MAX_ITERATIONS = 50
+_MAX_HALVINGS = 60
+_TOLERANCE = 1e-10
+_K_RANGE = (0.05, 50.0)
+# Spread of speeds over their mean below which a group counts as constant.
+_MIN_VARIANCE = 1e-24
+
+
+@dataclass
+class WeibullFit:
+    """Shape ``k`` and scale ``c`` per group, with the samples behind them.
+
+    ``keys`` maps each grouping name to the key value of every group.
+    """
+
+    k: np.ndarray
+    c: np.ndarray
+    n: np.ndarray
+    calms: np.ndarray
+    keys: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.k)
+
+    @property
+    def calm_fraction(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.calms / (self.n + self.calms)
+
+    def mean_speed(self) -> np.ndarray:
+        """Mean of the fitted distributions, ``c * Gamma(1 + 1/k)``."""
+        return self.c * np.vectorize(gamma, otypes=[float])(1.0 + 1.0 / self.k)
+
+
+def fit_weibull(
+    speed: np.ndarray, group: np.ndarray | None = None, min_samples: int = DEFAULT_MIN_SAMPLES
+) -> WeibullFit:
+    """Maximum-likelihood Weibull fit of ``speed`` within each ``group``.
+
+    ``group`` holds non-negative group ids (default: a single group); the
+    result is indexed by id.  Non-finite and negative speeds are ignored.
+    Groups whose speeds are all equal have no finite maximum-likelihood
+    ``k`` and are not fitted; a nearly constant group gets ``k`` at the
+    upper end of its range, 50.
+    """
+    x = np.asarray(speed, dtype=np.float64)
+    g = np.zeros(len(x), dtype=np.int64) if group is None else np.asarray(group, dtype=np.int64)
+    n_groups = int(g.max()) + 1 if len(g) else 0
+    ok = np.isfinite(x) & (x >= 0)
+    x, g = x[ok], g[ok]
+    calm = x == 0
+    calms = np.bincount(g[calm], minlength=n_groups)
+    x, g = x[~calm], g[~calm]
+
+    n = np.bincount(g, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = np.bincount(g, x, minlength=n_groups) / n
+        z = x / scale[g]
+        log_z = np.log(z)
+        mean_log = np.bincount(g, log_z, minlength=n_groups) / n
+        # Method-of-moments start: k ~ (std / mean) ** -1.086.
+        var = np.bincount(g, (z - 1.0) ** 2, minlength=n_groups) / n
+        k = np.clip(np.sqrt(var) ** -1.086, *_K_RANGE)
+    fit = (n >= max(min_samples, 2)) & (var > _MIN_VARIANCE)
+    k = np.where(fit, k, np.nan)
+
+    for _ in range(_MAX_ITERATIONS):
+        zk = z ** k[g]
+        s0 = np.bincount(g, zk, minlength=n_groups)
+        s1 = np.bincount(g, zk * log_z, minlength=n_groups)
+        s2 = np.bincount(g, zk * log_z * log_z, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = s1 / s0
+            f = ratio - 1.0 / k - mean_log
+            df = s2 / s0 - ratio * ratio + 1.0 / (k * k)
+            step = f / df
+        fit &= np.isfinite(step)
+        new_k = np.where(fit, k - step, np.nan)
+        # Newton converges from either side; halve steps that leave the range.
+        # Groups whose estimate lies beyond it end up pinned at the bound.
+        for _ in range(_MAX_HALVINGS):
+            bad = fit & ~((new_k > _K_RANGE[0]) & (new_k < _K_RANGE[1]))
+            if not bad.any():
+                break
+            step[bad] /= 2
+            new_k = np.where(fit, k - step, np.nan)
+        new_k = np.clip(new_k, *_K_RANGE)
+        converged = ~fit | (np.abs(new_k - k) <= _TOLERANCE * new_k)
+        k = new_k
+        if converged.all():
+            break
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        c = scale * (np.bincount(g, z ** k[g], minlength=n_groups) / n) ** (1.0 / k)
+    return WeibullFit(k=k, c=np.where(fit, c, np.nan), n=n, calms=calms)
+
+
+def weibull_climatology(
+    table: UplinkTable,
+    by=("month",),
+    sectors: int = DEFAULT_SECTORS,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+) -> WeibullFit:
+    """Weibull fits of ``table.speed`` grouped by any of ``"month"``, ``"sector"``, ``"hour"``.
+
+    Months and hours are local (America/New_York); sectors follow
+    :func:`~jamaica_bay.rose.direction_sectors`.  Only combinations that
+    occur are fitted; their key values are in ``keys``.
+    """
+    local = table.local_received_at()
+    columns = {}
+    for name in by:
+        if name == "month":
+            columns[name] = local.astype("datetime64[M]")
+        elif name == "hour":
+            columns[name] = (local.astype("datetime64[h]") - local.astype("datetime64[D]")).astype(np.int64)
+        elif name == "sector":
+            columns[name] = direction_sectors(table.dir, sectors)
+        else:
+            raise ValueError(f"unknown grouping {name!r}; expected month, sector or hour")
+    usable = np.isfinite(table.speed)
+    if "sector" in by:
+        usable &= np.isfinite(table.dir)
+    if not columns:
+        return fit_weibull(table.speed[usable], min_samples=min_samples)
+    codes = np.column_stack([columns[name][usable].view(np.int64) for name in by])
+    uniques, group = np.unique(codes, axis=0, return_inverse=True)
+    fit = fit_weibull(table.speed[usable], group.ravel(), min_samples)
+    fit.keys = {name: uniques[:, i].astype(np.int64).view(columns[name].dtype) for i, name in enumerate(by)}
+    return fit
@@ -0,0 +1,33 @@
+"""Shared fixtures: the two sample exports at the repository root."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from jamaica_bay import UplinkTable, deduplicate, load_export
+
+ROOT = Path(__file__).resolve().parent.parent
+#: Export with a header row and CRLF line endings.
+EXPORT_0924 = ROOT / "jamaica_bay_20250924.csv"
+#: Header-less export overlapping the end of the first one.
+EXPORT_1007 = ROOT / "jamaica_bay_20251007.csv"
+EXPORTS = (EXPORT_0924, EXPORT_1007)
+
+
+@pytest.fixture(scope="session")
+def table_0924() -> UplinkTable:
+    return load_export(EXPORT_0924)
+
+
+@pytest.fixture(scope="session")
+def table_1007() -> UplinkTable:
+    return load_export(EXPORT_1007)
+
+
+@pytest.fixture(scope="session")
+def uplinks(table_0924, table_1007) -> UplinkTable:
+    """Both exports merged, deduplicated and sorted by ``received_at``."""
+    table = deduplicate(UplinkTable.concat([table_0924, table_1007]))
+    return table.take(table.received_at.argsort(kind="stable"))
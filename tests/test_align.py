@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import CHANNELS, UplinkTable, align, frame_gaps, regular_grid
+
+
+def test_linear_interpolation_matches_interp(uplinks):
+    grid = regular_grid(uplinks.received_at[0], uplinks.received_at[-1], "10min")
+    aligned = align(uplinks, grid, max_gap=None)
+    assert list(aligned.columns) == list(CHANNELS)
+    assert aligned["speed"].shape == (1, len(grid))
+    t = uplinks.received_at.view(np.int64).astype(np.float64)
+    expected = np.interp(grid.view(np.int64).astype(np.float64), t, uplinks.temperature.astype(np.float64))
+    assert np.allclose(aligned.for_device("rm-0002")["temperature"], expected)
+
+
+def test_max_gap_and_outages(uplinks):
+    grid = regular_grid(uplinks.received_at[0], uplinks.received_at[-1], "10min")
+    loose = np.isnan(align(uplinks, grid, ("speed",), max_gap="1h")["speed"]).sum()
+    tight = np.isnan(align(uplinks, grid, ("speed",), max_gap="3min")["speed"]).sum()
+    gapped = align(uplinks, grid, ("speed",), max_gap="1h", gaps=frame_gaps(uplinks).outages(min_lost=5))
+    assert loose < np.isnan(gapped["speed"]).sum() and loose < tight
+    # No extrapolation past the first sample.
+    assert np.isnan(align(uplinks, uplinks.received_at[:1] - np.timedelta64(1, "s"))["speed"]).all()
+
+
+def test_direction_through_wind_components(uplinks):
+    two = uplinks.take(slice(0, 2))
+    two.dir = np.array([350.0, 10.0], dtype=np.float32)
+    two.speed = np.array([4.0, 4.0], dtype=np.float32)
+    mid = two.received_at[0] + (two.received_at[1] - two.received_at[0]) // 2
+    dir = align(two, [mid], ("dir",))["dir"][0, 0]
+    assert min(dir, 360.0 - dir) == pytest.approx(0.0, abs=1e-3)
+
+
+def test_many_devices_at_once(uplinks):
+    other = uplinks.take(slice(None))
+    other.device_id = np.full(len(other), uplinks.dictionary.add("rm-0099"), dtype=np.int32)
+    other.temperature = other.temperature + np.float32(1)
+    both = UplinkTable.concat([uplinks, other])
+    grid = regular_grid("2025-09-01", "2025-09-02", "15min")
+    aligned = align(both, grid, ("temperature",))
+    first, second = aligned.for_device("rm-0002"), aligned.for_device("rm-0099")
+    assert np.allclose(second["temperature"] - first["temperature"], 1.0, equal_nan=True)
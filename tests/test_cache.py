@@ -0,0 +1,50 @@
+import numpy as np
+
+from jamaica_bay import ExportCache
+
+from .conftest import EXPORT_0924, EXPORT_1007
+
+
+def test_cache_round_trip(tmp_path, uplinks, table_0924):
+    cache = ExportCache(tmp_path)
+    assert cache.add(EXPORT_0924) and cache.add(EXPORT_1007)
+    assert not cache.add(EXPORT_0924)
+    table = ExportCache(tmp_path).read()
+    assert len(table) == 55048
+    assert np.array_equal(np.sort(table.f_cnt), np.sort(uplinks.f_cnt))
+    assert len(cache.events()) == 1
+    one = cache.read(sources=[EXPORT_0924.name], dedupe=False)
+    assert len(one) == len(table_0924) and len(one.receptions) == len(table_0924.receptions)
+
+
+def test_cache_time_range_reads_only_overlapping_days(tmp_path, table_0924):
+    cache = ExportCache(tmp_path)
+    cache.add(EXPORT_0924)
+    start, end = np.datetime64("2025-09-01T06:00"), np.datetime64("2025-09-02T06:00")
+    assert len(cache.partitions(start, end)) == 2
+    expected = (table_0924.received_at >= start) & (table_0924.received_at < end)
+    assert len(cache.read(start, end)) == expected.sum()
+
+
+def test_cache_quantiles(tmp_path, table_0924):
+    cache = ExportCache(tmp_path)
+    cache.add(EXPORT_0924)
+    q = cache.quantiles("temperature", [0.1, 0.5, 0.9])
+    exact = np.quantile(table_0924.temperature, [0.1, 0.5, 0.9])
+    assert np.allclose(q, exact, atol=0.5)
+
+
+def test_cache_sketch_counts_overlapping_exports_once(tmp_path, uplinks):
+    cache = ExportCache(tmp_path)
+    cache.add(EXPORT_0924)
+    cache.add(EXPORT_1007)
+    assert len(cache.sketch("speed")) == len(uplinks) == 55048
+    day = np.datetime64("2025-09-24")
+    assert len(cache.sketch("speed", day, day + 1)) == (uplinks.local_days() == day).sum()
+    # Partial local days at both ends are cut at the exact wall-clock times.
+    start, end = np.datetime64("2025-09-01T06:00"), np.datetime64("2025-09-03T12:00")
+    local = uplinks.local_received_at()
+    expected = (local >= start) & (local < end)
+    assert len(cache.sketch("speed", start, end)) == expected.sum()
+    within = cache.sketch("speed", start, start + np.timedelta64(3, "h"))
+    assert len(within) == ((local >= start) & (local < start + np.timedelta64(3, "h"))).sum()
@@ -0,0 +1,26 @@
+import numpy as np
+
+from jamaica_bay import Dictionary
+
+
+def test_codes_are_stable_and_append_only(tmp_path):
+    dictionary = Dictionary(["rm-0002"])
+    codes = dictionary.encode(np.array([b"ngens-test-app", b"rm-0002", b"ngens-test-app"]))
+    assert codes.tolist() == [1, 0, 1]
+    assert dictionary.code("unknown") == -1
+    assert dictionary.decode(codes).tolist() == [b"ngens-test-app", b"rm-0002", b"ngens-test-app"]
+    dictionary.save(tmp_path / "d.json")
+    assert Dictionary.load(tmp_path / "d.json").values.tolist() == [b"rm-0002", b"ngens-test-app"]
+
+
+def test_translate_between_dictionaries():
+    source = Dictionary(["a", "b"])
+    target = Dictionary(["b"])
+    assert target.translate(np.array([0, 1, 0]), source).tolist() == [1, 0, 1]
+
+
+def test_tables_share_codes(table_0924, table_1007):
+    assert table_0924.dictionary is table_1007.dictionary
+    assert table_0924.device_id.dtype == np.int32
+    assert len(table_0924.for_device("rm-0002")) == len(table_0924)
+    assert len(table_0924.for_device("rm-9999")) == 0
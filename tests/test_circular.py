@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import DirectionStats
+from jamaica_bay.circular import mean_direction, yamartino_sigma
+
+
+def _sums(dir):
+    rad = np.radians(dir)
+    return np.sin(rad).sum(), np.cos(rad).sum(), len(dir)
+
+
+def test_mean_and_spread_of_directions():
+    s, c, n = _sums([350.0, 10.0])
+    assert mean_direction(s, c) == pytest.approx(0.0, abs=1e-9)
+    s, c, n = _sums([90.0] * 5)
+    assert yamartino_sigma(s, c, n) == pytest.approx(0.0, abs=1e-5)
+    assert np.isnan(mean_direction(0.0, 0.0))
+
+
+def test_streaming_add_remove(uplinks):
+    dir = uplinks.dir[:1000].astype(np.float64)
+    stats = DirectionStats()
+    stats.add(dir)
+    stats.remove(dir[:400])
+    s, c, n = _sums(dir[400:][~np.isnan(dir[400:])])
+    assert stats.mean_direction == pytest.approx(mean_direction(s, c))
+    assert stats.sigma_theta == pytest.approx(yamartino_sigma(s, c, n))
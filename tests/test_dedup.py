@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import UplinkTable, counter_epochs, deduplicate
+from jamaica_bay.dedup import HashIndex, first_copies, pack_keys, uplink_ids
+
+
+def test_merged_exports_dedupe(uplinks):
+    assert len(uplinks) == 55048
+    assert len(uplinks.receptions) == 147965
+    assert np.array_equal(np.sort(np.unique(uplinks.f_cnt)), np.sort(uplinks.f_cnt))
+
+
+def test_deduplicate_is_idempotent(uplinks):
+    assert len(deduplicate(uplinks)) == len(uplinks)
+
+
+def test_hash_index_groups_equal_keys():
+    keys = np.array([5, 7, 5, 9, 7, 5], dtype=np.int64)
+    ids = HashIndex(len(keys)).insert(keys)
+    assert ids[0] == ids[2] == ids[5] and ids[1] == ids[4]
+    assert len(set(ids.tolist())) == 3
+    assert first_copies(ids).tolist() == [0, 1, 3]
+
+
+def test_counter_reset_starts_new_epoch():
+    device = np.zeros(6, dtype=np.int32)
+    received_at = np.arange(6).astype("datetime64[s]").astype("datetime64[ns]")
+    f_cnt = np.array([100, 101, 102, 0, 1, 2])
+    assert counter_epochs(device, received_at, f_cnt).tolist() == [0, 0, 0, 1, 1, 1]
+    # The same counters before and after a reboot are different uplinks.
+    f_cnt = np.array([0, 1, 2, 0, 1, 2])
+    assert counter_epochs(device, received_at, f_cnt, max_rollback=1).tolist() == [0, 0, 0, 1, 1, 1]
+    assert len(set(uplink_ids(device, received_at, f_cnt, max_rollback=1).tolist())) == 6
+
+
+def test_empty_table():
+    assert len(deduplicate(UplinkTable.empty())) == 0
+
+
+def test_reboot_before_max_rollback_frames():
+    # 40 frames, a reboot, 40 more: the fall from 39 to 0 is within max_rollback.
+    device = np.zeros(80, dtype=np.int32)
+    received_at = np.datetime64("2025-09-01", "ns") + np.arange(80) * np.timedelta64(93, "s")
+    f_cnt = np.r_[np.arange(40), np.arange(40)]
+    assert counter_epochs(device, received_at, f_cnt).tolist() == [0] * 40 + [1] * 40
+    assert len(set(uplink_ids(device, received_at, f_cnt).tolist())) == 80
+    # Copies from overlapping exports still merge.
+    twice = np.r_[received_at, received_at]
+    assert len(set(uplink_ids(np.r_[device, device], twice, np.r_[f_cnt, f_cnt]).tolist())) == 80
+    # A frame delivered late is not a reboot.
+    assert counter_epochs(device[:5], received_at[:5], np.array([0, 1, 3, 2, 4])).tolist() == [0] * 5
+
+
+def test_gateway_codes_past_16_bits(uplinks):
+    table = uplinks.take(slice(0, 100))
+    # Codes 0x10000 apart used to collide with the next uplink's gateways.
+    table.receptions.gateway = table.receptions.gateway + (np.arange(len(table.receptions)) % 2) * 0x10000
+    assert len(deduplicate(table).receptions) == len(table.receptions)
+
+
+def test_pack_keys_rejects_wide_epochs():
+    with pytest.raises(ValueError):
+        pack_keys(np.zeros(1, dtype=np.int64), np.array([0x10000]), np.zeros(1, dtype=np.int64))
@@ -0,0 +1,56 @@
+import numpy as np
+
+from jamaica_bay import GapIndex, UplinkTable, delivery, frame_gaps, resample_wind, rolling_stats
+
+
+def test_gaps_from_frame_counters(table_0924, table_1007, uplinks):
+    gaps = frame_gaps(uplinks)
+    # 182092 -> 182102 at the start of the second export lost nine frames.
+    at = gaps.start == np.datetime64("2025-09-18T16:08:12.707437512")
+    assert gaps.lost[at].tolist() == [9]
+    # The setup note opens a new deployment: a reset of unknown length.
+    assert gaps.resets.sum() == 1
+    assert gaps.end[gaps.resets][0] == table_0924.events.received_at[0]
+    assert gaps.histogram().sum() == len(gaps) - 1
+    reversed_rows = table_1007.take(np.arange(len(table_1007))[::-1])
+    assert np.array_equal(frame_gaps(reversed_rows).lost, frame_gaps(table_1007).lost)
+
+
+def test_delivery_ratio(uplinks):
+    gaps = frame_gaps(uplinks)
+    daily = delivery(uplinks, "1d", gaps)
+    hourly = delivery(uplinks, "1h", gaps)
+    assert daily.received.sum() == hourly.received.sum() == len(uplinks)
+    assert daily.lost.sum() == hourly.lost.sum() == gaps.lost[~gaps.resets].sum()
+    assert 0.9 < daily.received.sum() / daily.expected.sum() < 1.0
+    assert np.nanmax(hourly.ratio) == 1.0
+
+
+def test_outages_split_rolling_windows(tmp_path, uplinks):
+    outages = frame_gaps(uplinks).outages(min_lost=5)
+    outages.save(tmp_path / "gaps.npz")
+    loaded = GapIndex.load(tmp_path / "gaps.npz", uplinks.dictionary)
+    assert np.array_equal(loaded.end, outages.end) and np.array_equal(loaded.device_id, outages.device_id)
+    segment = outages.segments(uplinks.device_id, uplinks.received_at)
+    assert segment.max() == len(outages)
+    first = np.flatnonzero(np.diff(segment))[0] + 1
+    stats = rolling_stats(uplinks, ("speed",), "1h", gaps=outages)["speed"]
+    assert stats.count[first] == 1
+    bins = resample_wind(uplinks, "10min", gaps=outages)
+    assert bins.outage.any() and not bins.outage.all()
+
+
+def test_empty_table():
+    empty = UplinkTable.empty()
+    assert len(frame_gaps(empty)) == 0
+    assert len(delivery(empty, "1d")) == 0
+
+
+def test_daily_delivery_follows_local_days(uplinks):
+    local = delivery(uplinks, "1d")
+    utc = delivery(uplinks, "1d", local=False)
+    days = uplinks.local_days()
+    assert local.start[0] == days.min() and local.start[-1] == days.max()
+    assert local.received.tolist() == np.bincount((days - days.min()).astype(np.int64)).tolist()
+    assert utc.start[0] == uplinks.received_at.min().astype("datetime64[D]")
+    assert local.lost.sum() == utc.lost.sum()
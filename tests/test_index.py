@@ -0,0 +1,24 @@
+import numpy as np
+
+from jamaica_bay import TimeIndex
+
+
+def test_windows_match_masks(tmp_path, uplinks):
+    index = TimeIndex.build(uplinks)
+    index.save(tmp_path)
+    index = TimeIndex.load(tmp_path)
+    starts = uplinks.received_at[::5000]
+    ends = starts + np.timedelta64(30, "m")
+    lo, hi = index.spans(starts, ends)
+    for s, e, a, b in zip(starts, ends, lo, hi):
+        assert b - a == ((uplinks.received_at >= s) & (uplinks.received_at < e)).sum()
+    window = index.window(starts[1], ends[1], ["speed"])
+    assert np.array_equal(window["speed"], uplinks.speed[lo[1] : hi[1]], equal_nan=True)
+
+
+def test_receptions_point_at_sorted_uplinks(uplinks):
+    index = TimeIndex.build(uplinks)
+    rc = index.receptions
+    assert np.all(np.diff(rc["time"][~np.isnat(rc["time"])].view(np.int64)) >= 0)
+    rows = index.gateway_window(rc["time"][100], rc["time"][200])["uplink"]
+    assert np.all(np.abs(index.received_at[rows] - rc["time"][100:200]) < np.timedelta64(10, "m"))
@@ -0,0 +1,50 @@
+import numpy as np
+
+from jamaica_bay import Watermark, ingest, read_new
+from jamaica_bay.ingest import tail_offset
+
+from .conftest import EXPORT_0924, EXPORT_1007
+
+
+def test_ingest_overlapping_exports(tmp_path):
+    state = tmp_path / "watermark.json"
+    assert len(ingest(EXPORT_0924, state)) == 43727
+    assert len(ingest(EXPORT_1007, state)) == 11324
+    assert len(ingest(EXPORT_1007, state)) == 0
+    assert Watermark.load(state).devices["rm-0002"] == (1759860976487801308, 199837)
+
+
+def test_read_new_keeps_rows_past_watermark(table_0924):
+    watermark = Watermark()
+    watermark.advance(table_0924.take(slice(0, 40000)))
+    new = read_new(EXPORT_0924, watermark)
+    assert np.array_equal(new.f_cnt, table_0924.f_cnt[40000:][watermark.is_new(table_0924.take(slice(40000, None)))])
+
+
+def test_tail_offset_skips_older_lines(table_0924):
+    since = table_0924.received_at[30000]
+    with open(EXPORT_0924, "rb") as fh:
+        offset = tail_offset(fh, since, 2)
+        fh.seek(offset)
+        first = fh.readline().split(b",")[2]
+    assert np.datetime64(first.rstrip(b"Z").decode(), "ns") <= since
+    assert 0 < offset < EXPORT_0924.stat().st_size
+
+
+def _relabel(path, target, rows, device=b"rm-0003"):
+    lines = path.read_bytes().split(b"\n")
+    # Line 0 is the header.
+    for i in rows:
+        lines[i + 1] = device + lines[i + 1][len(b"rm-0002") :]
+    target.write_bytes(b"\n".join(lines))
+    return target
+
+
+def test_device_missing_from_watermark_is_read_in_full(tmp_path, table_0924):
+    watermark = Watermark()
+    watermark.advance(table_0924)
+    head = _relabel(EXPORT_0924, tmp_path / "head.csv", range(20000))
+    assert (read_new(head, watermark).device_names() == b"rm-0003").sum() == 20000
+    tail = _relabel(EXPORT_0924, tmp_path / "tail.csv", range(43700, 43720))
+    assert (read_new(tail, watermark).device_names() == b"rm-0003").sum() == 20
+    assert len(read_new(EXPORT_0924, watermark)) == 0
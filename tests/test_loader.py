@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import UPLINK_V1, SchemaError, load_export, parse_buffer, sniff
+from jamaica_bay.timestamps import parse_local_time, parse_rfc3339, rfc3339_ns
+
+from .conftest import EXPORT_0924, EXPORT_1007
+
+
+def test_row_counts(table_0924, table_1007):
+    assert len(table_0924) == 43727
+    assert len(table_1007) == 16504
+
+
+def test_first_row_columns(table_0924):
+    assert table_0924.device_names()[0] == b"rm-0002"
+    assert table_0924.received_at[0] == np.datetime64("2025-08-06T00:02:59.268935556")
+    assert table_0924.f_cnt[:5].tolist() == [141519, 141520, 141522, 141523, 141524]
+    assert table_0924.speed.dtype == np.float32
+    assert table_0924.speed[0] == np.float32(2.4)
+    assert table_0924.dir[0] == np.float32(109)
+
+
+def test_receptions_long_format(table_0924, table_1007):
+    rc = table_0924.receptions
+    assert len(rc) == 121936
+    assert len(table_1007.receptions) == 38929
+    assert rc.uplink[:2].tolist() == [0, 0]
+    assert rc.gateway_names()[:2].tolist() == [b"irt-mudd-rooftop-gateway", b"ttn-nyc-00-08-00-4b-04-64"]
+    assert rc.rssi[:2].tolist() == [-89, -110]
+    assert rc.time[1] == np.datetime64("2025-08-06T00:02:58.918880939")
+    assert len(rc.for_gateway("fngw-10001")) == 35247
+
+
+def test_sniff_header_and_headerless():
+    assert sniff(EXPORT_0924.read_bytes()[:8192]) == (UPLINK_V1, True)
+    assert sniff(EXPORT_1007.read_bytes()[:8192]) == (UPLINK_V1, False)
+    with pytest.raises(SchemaError):
+        sniff(b"a,b,c\n1,2,3\n")
+
+
+def test_annotation_rows_become_events(table_0924, table_1007):
+    events = table_0924.events
+    assert len(events) == 1 and len(table_1007.events) == 0
+    assert events.text[0] == b"SETUP IN LIVING SHOERLINE AT JAMAICA BAY WILDLIFE REFUGE"
+    assert events.latitude[0] == pytest.approx(40.615567)
+    assert events.longitude[0] == pytest.approx(-73.830619)
+    assert table_0924.f_cnt.min() >= 0
+
+
+def test_rfc3339_matches_numpy(table_0924):
+    assert rfc3339_ns("2025-08-06T00:02:59.268935556Z") == table_0924.received_at[0].view(np.int64)
+    assert rfc3339_ns("2025-08-06T00:02:59.020Z") == np.datetime64("2025-08-06T00:02:59.020", "ns").view(np.int64)
+
+
+def test_local_time_and_dst_offset(table_0924):
+    assert table_0924.local_time[0] == np.datetime64("2025-08-05T20:03:03")
+    # Summer: New York is UTC-4.
+    assert set(table_0924.utc_offset.tolist()) == {-240}
+    skew = table_0924.local_received_at() - table_0924.local_time
+    assert np.all(np.abs(skew) < np.timedelta64(10, "m"))
+
+
+def test_parse_buffer_matches_load_export(table_1007):
+    table = parse_buffer(EXPORT_1007.read_bytes())
+    assert np.array_equal(table.received_at, table_1007.received_at)
+    assert np.array_equal(table.f_cnt, load_export(EXPORT_1007).f_cnt)
+
+
+def test_header_only_export_is_empty():
+    header = EXPORT_0924.read_bytes().split(b"\n", 1)[0]
+    for data in (header, header + b"\n"):
+        table = parse_buffer(data)
+        assert len(table) == 0 and len(table.receptions) == 0 and len(table.events) == 0
+
+
+def test_event_location_that_is_not_coordinates(table_0924):
+    note = EXPORT_0924.read_bytes().split(b"\r\n")[38548]
+    rows = [note.replace(b'"40.615567, -73.830619"', text) for text in (b'"near dock, east side"', b'"40.6N, 73.8W"')]
+    table = parse_buffer(b"\r\n".join(rows) + b"\r\n", UPLINK_V1)
+    assert table.events.location.tolist() == [b"near dock, east side", b"40.6N, 73.8W"]
+    assert np.isnan(table.events.latitude).all() and np.isnan(table.events.longitude).all()
+    assert table_0924.events.location[0] == b"40.615567, -73.830619"
+
+
+def _column(*values):
+    ends = np.cumsum([len(v) for v in values])
+    return np.frombuffer(b"".join(values), dtype=np.uint8), ends - [len(v) for v in values], ends
+
+
+def test_rfc3339_rejects_fields_out_of_range():
+    for value in (b"2025-13-45T29:99:99Z", b"2025-02-29T00:00:00Z", b"2025-08-06T24:00:00Z"):
+        with pytest.raises(ValueError):
+            parse_rfc3339(*_column(value))
+        with pytest.raises(ValueError):
+            rfc3339_ns(value.decode())
+    leap = parse_rfc3339(*_column(b"2024-02-29T23:59:59.5Z"))
+    assert leap[0] == np.datetime64("2024-02-29T23:59:59.5", "ns").view(np.int64)
+
+
+def test_local_time_rejects_bad_digits_and_ranges():
+    for value in (b"8/5/2025 2x:03:03", b"2/30/2025 1:00:00", b"13/5/2025 1:00:00", b"8/5/2025 20:60:00"):
+        with pytest.raises(ValueError):
+            parse_local_time(*_column(value))
+    decoded = parse_local_time(*_column(b"12/31/2025 23:59:59", b"2/29/2024 0:00:00"))
+    assert decoded.view("datetime64[ns]").tolist() == np.array(["2025-12-31T23:59:59", "2024-02-29"], "datetime64[ns]").tolist()
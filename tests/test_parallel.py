@@ -0,0 +1,14 @@
+import numpy as np
+
+from jamaica_bay import ingest_parallel
+
+from .conftest import EXPORTS
+
+
+def test_parallel_matches_full_load(uplinks):
+    table = ingest_parallel(EXPORTS, max_workers=2, split_bytes=4 << 20)
+    assert len(table) == 55048
+    assert np.all(np.diff(table.received_at.view(np.int64)) >= 0)
+    assert np.array_equal(table.f_cnt, uplinks.f_cnt)
+    assert len(table.receptions) == len(uplinks.receptions)
+    assert len(table.events) == 1
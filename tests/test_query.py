@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import ExportCache, scan
+
+from .conftest import EXPORT_0924, EXPORTS
+
+START, END = np.datetime64("2025-09-20", "ns"), np.datetime64("2025-09-22", "ns")
+
+
+def _expected(uplinks):
+    rows = (uplinks.received_at >= START) & (uplinks.received_at < END)
+    return uplinks.take(rows)
+
+
+def test_filter_select_over_exports(uplinks):
+    query = scan(EXPORTS).filter(START, END).select("received_at", "speed")
+    assert all(stop - first < EXPORT_0924.stat().st_size for _, first, stop in query.plan())
+    columns = query.collect()
+    assert list(columns) == ["received_at", "speed"]
+    expected = _expected(uplinks)
+    order = np.argsort(columns["received_at"], kind="stable")
+    assert np.array_equal(columns["received_at"][order], expected.received_at)
+    assert np.array_equal(columns["speed"][order], expected.speed, equal_nan=True)
+
+
+def test_scan_over_cache(tmp_path, uplinks):
+    cache = ExportCache(tmp_path)
+    for path in EXPORTS:
+        cache.add(path)
+    table = scan(cache).filter(START, END).to_table()
+    assert len(table) == len(_expected(uplinks))
+    assert len(scan(cache).filter(START, END).plan()) == 4
+
+
+def test_select_unknown_column():
+    with pytest.raises(KeyError):
+        scan(EXPORTS).select("speed").select("dir")
+    assert scan(EXPORTS).select().collect() == {}
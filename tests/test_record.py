@@ -0,0 +1,40 @@
+import csv
+import math
+
+from jamaica_bay import UPLINK_V1, Uplink, iter_uplinks
+from jamaica_bay.record import to_table
+
+from .conftest import EXPORT_0924
+
+
+def test_from_row_matches_table(table_0924):
+    with open(EXPORT_0924, newline="") as fh:
+        rows = csv.reader(fh)
+        next(rows)
+        row = next(rows)
+    record = Uplink.from_row(row, UPLINK_V1, table_0924.dictionary)
+    assert record == next(iter_uplinks(table_0924))
+    assert record.f_cnt == 141519
+    assert record.n_receptions == 2
+    assert abs(record.speed - 2.4) < 1e-6
+
+
+def test_round_trip_through_records(table_0924):
+    head = table_0924.take(slice(0, 500))
+    back = to_table(iter_uplinks(head), head.dictionary)
+    assert back.f_cnt.tolist() == head.f_cnt.tolist()
+    assert (back.received_at == head.received_at).all()
+    assert len(back.receptions) == len(head.receptions)
+    assert not hasattr(Uplink(0, 1, 2, [0.0] * 6), "__dict__")
+
+
+def test_from_row_pads_ragged_rows(table_0924):
+    with open(EXPORT_0924, newline="") as fh:
+        rows = csv.reader(fh)
+        next(rows)
+        row = next(rows)
+    _, _, rssi, _ = UPLINK_V1.reception_groups[1]
+    record = Uplink.from_row(row[: rssi + 1], UPLINK_V1, table_0924.dictionary)
+    assert record.n_receptions == 2
+    assert record.receptions[1][2] == int(row[rssi])
+    assert math.isnan(record.receptions[1][3])
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import resample_wind, wind_levels
+from jamaica_bay.resample import parse_interval, wind_bins
+
+
+def test_vector_average_wraps_at_north():
+    t = np.array(["2025-01-01T00:01", "2025-01-01T00:02"], dtype="datetime64[ns]")
+    bins = wind_bins(t, [5.0, 5.0], [350.0, 10.0], "10min")
+    assert len(bins) == 1 and bins.count[0] == 2
+    assert bins.dir[0] == pytest.approx(0.0, abs=1e-9)
+    assert bins.speed[0] == 5.0
+    assert bins.vector_speed[0] == pytest.approx(5 * np.cos(np.radians(10)))
+
+
+def test_bins_cover_every_sample(uplinks):
+    bins = resample_wind(uplinks, "10min")
+    usable = np.isfinite(uplinks.speed) & np.isfinite(uplinks.dir)
+    assert bins.count.sum() == usable.sum()
+    assert np.all(np.diff(bins.start) == np.timedelta64(10, "m"))
+    assert np.isnan(bins.speed[bins.count == 0]).all()
+
+
+def test_levels_coarsen_like_direct_binning(uplinks):
+    levels = wind_levels(uplinks, ("1min", "10min", "1h"))
+    direct = resample_wind(uplinks, "1h")
+    assert np.array_equal(levels["1h"].start, direct.start)
+    assert np.array_equal(levels["1h"].count, direct.count)
+    assert np.allclose(levels["1h"].u_sum, direct.u_sum)
+    assert np.allclose(levels["1h"].sigma_theta, direct.sigma_theta, equal_nan=True)
+
+
+def test_parse_interval():
+    assert parse_interval("90s") == np.timedelta64(90, "s")
+    assert parse_interval("1d") == np.timedelta64(1, "D")
+    with pytest.raises(ValueError):
+        parse_interval("3 fortnights")
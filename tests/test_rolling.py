@@ -0,0 +1,80 @@
+import numpy as np
+
+from jamaica_bay import GustDetector, StreamingStats, UplinkTable, frame_gaps, gusts, rolling_stats
+from jamaica_bay.rolling import rolling_max, rolling_moments
+
+
+def _brute(t, x, i, window):
+    rows = (t > t[i] - window) & (t <= t[i]) & ~np.isnan(x)
+    return x[rows]
+
+
+def test_rolling_max_matches_brute_force(uplinks):
+    t, x = uplinks.received_at, uplinks.speed.astype(np.float64)
+    peak, when = rolling_max(t, x, "10min")
+    for i in range(0, len(t), 997):
+        window = _brute(t, x, i, np.timedelta64(10, "m"))
+        assert peak[i] == window.max()
+        assert x[t == when[i]].max() == peak[i]
+
+
+def test_rolling_moments_match_brute_force(uplinks):
+    t, x = uplinks.received_at, uplinks.temperature.astype(np.float64)
+    count, mean, var = rolling_moments(t, x, "1h")
+    for i in range(0, len(t), 997):
+        window = _brute(t, x, i, np.timedelta64(1, "h"))
+        assert count[i] == window.size
+        assert np.isclose(mean[i], window.mean())
+        assert np.isclose(var[i], window.var(ddof=1)) if window.size > 1 else np.isnan(var[i])
+
+
+def test_streaming_matches_batch(uplinks):
+    head = uplinks.take(slice(0, 3000))
+    stats = rolling_stats(head, ("speed", "pressure"), "30min")
+    gust = gusts(head, "10min")
+    streaming = StreamingStats(2, "30min")
+    detector = GustDetector("10min")
+    t = head.received_at.view(np.int64).tolist()
+    for i in range(len(head)):
+        streaming.push(t[i], (head.speed[i], head.pressure[i]))
+        peak, _, factor = detector.push(t[i], float(head.speed[i]))
+        assert np.isclose(streaming.mean[0], stats["speed"].mean[i])
+        assert np.isclose(streaming.var[1], stats["pressure"].var[i], equal_nan=True)
+        assert streaming.max[1] == stats["pressure"].max[i]
+        assert peak == gust.peak[i] and np.isclose(factor, gust.gust_factor[i], equal_nan=True)
+
+
+def _with_calm_twin(table):
+    """``table`` and a copy of it as device rm-0003 reporting no wind."""
+    twin = table.take(slice(None))
+    twin.device_id = np.full(len(twin), table.dictionary.encode(np.array([b"rm-0003"]))[0], dtype=np.int32)
+    twin.speed = np.zeros_like(twin.speed)
+    return UplinkTable.concat([table, twin])
+
+
+def test_gusts_per_device(uplinks):
+    head = uplinks.take(slice(0, 3000))
+    alone = gusts(head, "10min")
+    both = gusts(_with_calm_twin(head), "10min")
+    assert np.array_equal(both.peak[: len(head)], alone.peak)
+    assert np.array_equal(both.peak_time[: len(head)], alone.peak_time)
+    assert np.allclose(both.gust_factor[: len(head)], alone.gust_factor, equal_nan=True)
+    assert (both.peak[len(head) :] == 0).all()
+
+
+def test_rolling_stats_per_device(uplinks):
+    head = uplinks.take(slice(0, 3000))
+    table = _with_calm_twin(head)
+    for gaps, head_gaps in ((None, None), (frame_gaps(table), frame_gaps(head))):
+        both = rolling_stats(table, ("speed",), "1h", gaps=gaps)["speed"]
+        alone = rolling_stats(head, ("speed",), "1h", gaps=head_gaps)["speed"]
+        assert np.array_equal(both.count[: len(head)], alone.count)
+        assert np.allclose(both.mean[: len(head)], alone.mean)
+        assert np.array_equal(both.max[: len(head)], alone.max)
+        assert np.allclose(both.mean[len(head) :], 0.0)
+
+
+def test_empty_input():
+    empty = UplinkTable.empty()
+    assert all(len(s.count) == 0 for s in rolling_stats(empty).values())
+    assert len(gusts(empty).peak) == 0
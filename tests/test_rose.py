@@ -0,0 +1,26 @@
+import numpy as np
+
+from jamaica_bay import DailyRoses
+from jamaica_bay.rose import direction_sectors
+
+
+def test_incremental_matches_one_shot(tmp_path, uplinks):
+    whole = DailyRoses()
+    whole.update(uplinks)
+    half = len(uplinks) // 2
+    parts = DailyRoses()
+    parts.update(uplinks.take(slice(half, None)))
+    parts.update(uplinks.take(slice(0, half)))
+    assert np.array_equal(parts.counts, whole.counts) and parts.first_day == whole.first_day
+    usable = np.isfinite(uplinks.speed) & np.isfinite(uplinks.dir)
+    assert whole.rose().total == usable.sum()
+
+    whole.save(tmp_path / "roses.npz")
+    loaded = DailyRoses.load(tmp_path / "roses.npz")
+    assert np.array_equal(loaded.counts, whole.counts)
+    day = whole.days[10]
+    assert loaded.rose(day, day + 1).total == whole.counts[10].sum()
+
+
+def test_sectors_centred_on_north():
+    assert direction_sectors(np.array([0.0, 11.0, 12.0, 349.0, 359.9, 180.0])).tolist() == [0, 0, 1, 0, 0, 8]
@@ -0,0 +1,26 @@
+import numpy as np
+
+from jamaica_bay import KLLSketch
+
+
+def test_quantiles_within_rank_error(tmp_path):
+    values = np.random.default_rng(1).normal(size=100_000)
+    sketch = KLLSketch()
+    for chunk in np.array_split(values, 200):
+        sketch.update(chunk)
+    assert len(sketch) == values.size and sketch.size < 2000
+    q = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(q)) / values.size
+    assert np.abs(ranks - q).max() < 0.01
+    sketch.save(tmp_path / "s.npz")
+    assert np.array_equal(KLLSketch.load(tmp_path / "s.npz").quantile(q), sketch.quantile(q))
+
+
+def test_merge_equals_union():
+    rng = np.random.default_rng(2)
+    a, b = rng.uniform(0, 1, 50_000), rng.uniform(1, 2, 50_000)
+    merged = KLLSketch.of(a)
+    merged.merge(KLLSketch.of(b))
+    assert len(merged) == 100_000
+    assert abs(merged.quantile(0.5) - 1.0) < 0.02
+    assert np.isnan(KLLSketch().quantile(0.5))
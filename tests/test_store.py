@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import CHANNELS, ChannelStore, deduplicate
+
+
+def test_append_is_idempotent_and_memory_mapped(tmp_path, table_0924, uplinks):
+    first = deduplicate(table_0924)
+    store = ChannelStore.create(tmp_path, "rm-0002")
+    assert store.append(first) == len(first)
+    assert store.append(first) == 0
+    tail = uplinks.received_at > first.received_at.max()
+    assert store.append(uplinks) == tail.sum()
+
+    reopened = ChannelStore(tmp_path)
+    assert len(reopened) == len(first) + tail.sum()
+    assert isinstance(reopened.channel("speed"), np.memmap)
+    assert np.all(np.diff(reopened.received_at.view(np.int64)) >= 0)
+    for name in CHANNELS:
+        assert np.array_equal(reopened[name][-tail.sum() :], getattr(uplinks, name)[tail], equal_nan=True)
+    with pytest.raises(KeyError):
+        reopened.channel("f_cnt")
@@ -0,0 +1,20 @@
+import numpy as np
+
+from jamaica_bay import UplinkTable, iter_batches
+
+from .conftest import EXPORT_0924, EXPORT_1007
+
+
+def test_batches_match_full_load(table_0924):
+    batches = list(iter_batches(EXPORT_0924, batch_rows=5000, block_bytes=1 << 20))
+    assert all(len(b) <= 5000 for b in batches)
+    table = UplinkTable.concat(batches)
+    assert np.array_equal(table.received_at, table_0924.received_at)
+    assert np.array_equal(table.speed, table_0924.speed, equal_nan=True)
+    assert len(table.receptions) == len(table_0924.receptions)
+    assert len(table.events) == 1
+
+
+def test_headerless_export_small_blocks(table_1007):
+    table = UplinkTable.concat(list(iter_batches(EXPORT_1007, block_bytes=64 << 10)))
+    assert np.array_equal(table.f_cnt, table_1007.f_cnt)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from jamaica_bay import fit_weibull, weibull_climatology
+
+
+def test_recovers_known_parameters():
+    rng = np.random.default_rng(3)
+    k, c = np.array([1.6, 2.4, 3.5]), np.array([3.0, 6.0, 1.5])
+    group = np.repeat(np.arange(3), 20_000)
+    speed = c[group] * rng.weibull(k[group])
+    fit = fit_weibull(speed, group)
+    assert np.allclose(fit.k, k, rtol=0.03)
+    assert np.allclose(fit.c, c, rtol=0.03)
+    assert fit.n.tolist() == [20_000] * 3
+
+
+def test_calms_and_small_groups():
+    speed = np.r_[np.zeros(5), np.linspace(0.5, 5.0, 40), [1.0, 2.0]]
+    group = np.r_[np.zeros(45, dtype=int), [1, 1]]
+    fit = fit_weibull(speed, group)
+    assert fit.calms.tolist() == [5, 0]
+    assert fit.calm_fraction[0] == pytest.approx(5 / 45)
+    assert np.isfinite(fit.k[0]) and np.isnan(fit.k[1])
+
+
+def test_monthly_climatology(uplinks):
+    fit = weibull_climatology(uplinks, by=("month", "sector"))
+    months = fit.keys["month"]
+    assert set(months.astype(str)) <= {"2025-08", "2025-09", "2025-10"}
+    assert fit.n.sum() + fit.calms.sum() == (np.isfinite(uplinks.speed) & np.isfinite(uplinks.dir)).sum()
+    ok = np.isfinite(fit.k)
+    assert np.all((fit.k[ok] > 0.05) & (fit.k[ok] < 50))
+
+
+def test_constant_groups_terminate():
+    speed = np.r_[np.full(50, 2.0), np.full(20, 1.0), np.full(20, 1.0000001), np.full(30, 0.1)]
+    group = np.repeat([0, 1, 2], [50, 40, 30])
+    fit = fit_weibull(speed, group)
+    assert np.isnan(fit.k[0]) and np.isnan(fit.c[0])
+    assert fit.k[1] == 50.0 and fit.c[1] == pytest.approx(1.0, rel=1e-6)
+    assert np.isnan(fit.k[2])
+    assert np.isnan(fit_weibull(np.full(50, 2.0)).k[0])